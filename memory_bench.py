@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""Memory benchmarks for schema instances storage modes.
+"""
+import gc
+import tracemalloc
+from schema_factory import BaseSchema, IntegerNode, StringNode, FloatNode, MappingNode
+
+
+COUNT = 100000
+
+object_list = [{'attr_1': str(x), 'attr_2': x, 'attr_3': x / 3.0, 'attr_4': '{"key": %d}' % x}
+               for x in range(COUNT)]
+
+
+class TestSchema(BaseSchema):
+    attr_1 = StringNode()
+    attr_2 = IntegerNode()
+    attr_3 = FloatNode()
+    attr_4 = MappingNode()
+
+
+class FrozenTestSchema(BaseSchema, frozen=True):
+    attr_1 = StringNode()
+    attr_2 = IntegerNode()
+    attr_3 = FloatNode()
+    attr_4 = MappingNode()
+
+
+class LazyTestSchema(BaseSchema):
+    attr_1 = StringNode()
+    attr_2 = IntegerNode()
+    attr_3 = FloatNode()
+    attr_4 = MappingNode(lazy=True)
+
+
+def measure(name, loader):
+    gc.collect()
+    tracemalloc.start()
+    snapshot = tracemalloc.take_snapshot()
+
+    result = loader()
+
+    allocated = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(snapshot, 'filename'))
+    tracemalloc.stop()
+
+    print('{:<10} {:>8.1f} bytes per instance (tracemalloc)'.format(name, allocated / COUNT))
+
+    if isinstance(result, list) and isinstance(result[0], BaseSchema):
+        report = result[0].__class__.memory_report(result)
+        print('{:<10} {:>8.1f} bytes per instance (memory_report)'.format('', report['bytes_per_instance']))
+
+    return result
+
+
+if __name__ == '__main__':
+
+    measure('regular', lambda: [TestSchema(**obj) for obj in object_list])
+    measure('frozen', lambda: [FrozenTestSchema(**obj) for obj in object_list])
+    measure('lazy', lambda: [LazyTestSchema(**obj) for obj in object_list])
+    measure('packed', lambda: TestSchema.pack_many(TestSchema(**obj) for obj in object_list))
@@ -22,8 +22,11 @@ Provides schema factory utilities.
 
 
 __all__ = ['schema_factory', 'SchemaType', 'BaseNode', 'IntegerNode', 'FloatNode', 'StringNode',
-           'BooleanNode', 'TimestampNode', 'MappingNode', 'SchemaNode', 'validator_message', 'BaseSchema',
-           'SchemaError', 'NodeTypeError', 'SchemaNodeError', 'SchemaNodeValidatorError', 'SchemaFactoryError']
+           'BooleanNode', 'TimestampNode', 'MappingNode', 'SchemaNode', 'UnionNode', 'validator_message',
+           'BaseSchema',
+           'SchemaError', 'NodeTypeError', 'SchemaNodeError', 'SchemaNodeValidatorError', 'SchemaFactoryError',
+           'SchemaRegistry', 'ValidationCache', 'SchemaVersions', 'SchemaCollection', 'computed',
+           'set_engine', 'impure_validator']
 
 __authors__ = 'Papavassiliou Vassilis'
 __date__ = '2016-8-6'
@@ -32,6 +35,11 @@ __version__ = '1.7.12'
 from schema_factory.schema import *
 from schema_factory.nodes import *
 from schema_factory.errors import *
+from schema_factory.registry import *
+from schema_factory.cache import *
+from schema_factory.migrations import *
+from schema_factory.collection import *
+from schema_factory.engines import *
 
 
 def validator_message(msg=''):  # pragma: no cover
@@ -48,3 +56,18 @@ def validator_message(msg=''):  # pragma: no cover
         return func
 
     return _wrapped
+
+
+def impure_validator(func):  # pragma: no cover
+    """Marks a validator as impure (its result may change for the same value).
+
+    Schemas with impure validators bypass their `ValidationCache`.
+
+    Args:
+        func (callable): The validator function.
+
+    Returns:
+        Function.
+    """
+    func.__impure__ = True
+    return func
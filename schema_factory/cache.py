@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.cache` module.
+
+Provides a bounded validation result cache for schema classes, keyed by a
+typed canonical form of the input, for inputs that are delivered many times.
+"""
+
+__all__ = ['ValidationCache']
+
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, time as time_of_day, timedelta
+from schema_factory.errors import SchemaFactoryError
+from schema_factory.memory import deep_sizeof
+from schema_factory.types import Schema, Union
+
+
+# Immutable values shared between a cached result and its copies.
+_ATOMIC = (type(None), bool, int, float, complex, str, bytes, date, datetime, time_of_day, timedelta)
+
+
+# Type tags of the scalar values a cache key can hold.
+_SCALAR_TAGS = {type(None): 'n', bool: 'b', int: 'i', float: 'f', str: 's', bytes: 'y'}
+
+
+def _typed_key(data):
+    """Hashable canonical form of `data` that keeps the type of every value.
+
+    Raises:
+        TypeError, for values of other types.
+    """
+    data_type = type(data)
+    tag = _SCALAR_TAGS.get(data_type)
+
+    if tag is not None:
+        # Hex text keeps -0.0 apart from 0.0 and makes NaN keys equal.
+        return tag, data.hex() if data_type is float else data
+
+    if data_type is dict:
+        return 'd', frozenset((_typed_key(key), _typed_key(value)) for key, value in data.items())
+
+    if data_type is list:
+        return 'l', tuple(_typed_key(item) for item in data)
+
+    if data_type is tuple:
+        return 't', tuple(_typed_key(item) for item in data)
+
+    raise TypeError('Uncacheable value of type {}.'.format(data_type.__name__))
+
+
+def _clone(instance):
+    """Copy a schema instance storage, deep copying only mutable values.
+    """
+    cls = instance.__class__
+    clone = cls.__new__(cls)
+    storage = clone.__dict__
+    memo = {id(instance): clone}
+
+    for key, value in instance.__dict__.items():
+        storage[key] = value if isinstance(value, _ATOMIC) else copy.deepcopy(value, memo)
+
+    return clone
+
+
+def is_impure(schema, _seen=None):
+    """Check whether `schema` (or a nested schema) declares impure validators.
+    """
+    seen = set() if _seen is None else _seen
+
+    if schema in seen:
+        return False
+
+    seen.add(schema)
+
+    for node in schema._node_map.values():
+        if any(getattr(validator, '__impure__', False) for validator in node.validators):
+            return True
+
+        field_type = node.field_type
+
+        if isinstance(field_type, Schema) and hasattr(field_type.cast_type, '_node_map'):
+            nested = (field_type.cast_type, )
+
+        elif isinstance(field_type, Union):
+            nested = field_type.schemas
+
+        else:
+            nested = ()
+
+        if any(is_impure(nested_schema, seen) for nested_schema in nested):
+            return True
+
+    return False
+
+
+class ValidationCache(object):
+    """Bounded LRU cache of validation results.
+
+    Both valid results and validation errors are cached. Entries are keyed by
+    a canonical form of the input that keeps value types apart (`1`, `'1'` and
+    `True` keys, lists and tuples); inputs holding values other than None,
+    bool, int, float, str, bytes, dicts, lists and tuples are not cached.
+
+    Args:
+        maxsize (int): Maximum number of entries.
+        max_bytes (int): Maximum estimated size of keys and results, in bytes.
+        ttl (float): Entry lifetime in seconds, unlimited when omitted.
+
+    Examples:
+
+        >>> from schema_factory import schema_factory, IntegerNode
+        >>> CountSchema = schema_factory('count', count=IntegerNode())
+        >>> CountSchema.validation_cache = ValidationCache(maxsize=100)
+        >>> CountSchema.validate({'count': '1'}).count
+        1
+        >>> CountSchema.validate({'count': '1'}).count
+        1
+        >>> CountSchema.validation_cache.hits, CountSchema.validation_cache.misses
+        (1, 1)
+    """
+
+    def __init__(self, maxsize=1024, max_bytes=None, ttl=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(data):
+        """Canonical cache key of `data`, None if it cannot be canonicalized.
+        """
+        try:
+            return _typed_key(data)
+
+        except (TypeError, RecursionError):
+            return None
+
+    def get(self, key):
+        """Return the cached `(result, error)` pair of `key`, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and self.ttl is not None and entry[0] < time.monotonic():
+                self._evict(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+            return entry[2], entry[3]
+
+    def put(self, key, result=None, error=None):
+        """Cache the validation `result` or `error` of `key`.
+        """
+        size = deep_sizeof(key, set()) + deep_sizeof(result, set()) + deep_sizeof(error, set())
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+
+        with self._lock:
+            if key in self._entries:
+                self._evict(key)
+
+            self._entries[key] = (expires, size, result, error)
+            self.bytes += size
+
+            while self._entries and (len(self._entries) > self.maxsize or
+                                     (self.max_bytes is not None and self.bytes > self.max_bytes)):
+                self._evict(next(iter(self._entries)))
+
+    def _evict(self, key):
+        self.bytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def validate(self, schema, data):
+        """Validate `data` against `schema`, reusing cached results.
+
+        Frozen results are shared; the storage of mutable results is copied
+        (mutable values deeply), so callers never modify a cached instance.
+
+        Raises:
+            The cached (or raised) SchemaFactoryError for invalid inputs.
+        """
+        canonical = self.key(data)
+
+        if canonical is None:
+            return schema(**data)
+
+        # Schemas may share a cache, e.g. through inheritance.
+        key = (schema, canonical)
+        entry = self.get(key)
+
+        if entry is None:
+            try:
+                result = schema(**data)
+
+            except SchemaFactoryError as error:
+                self.put(key, error=(error.__class__, error.args))
+                raise
+
+            self.put(key, result=result)
+            entry = (result, None)
+
+        result, error = entry
+
+        if error is not None:
+            error_cls, args = error
+            raise error_cls(*args)
+
+        return result if schema.__frozen__ else _clone(result)
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.codec` module.
+
+Provides a compact, positional binary encoding of schema instances. Values are
+written in `schema_nodes` order without key names, behind a header holding a
+schema layout fingerprint. Schemas whose nodes are all scalar `IntegerNode`,
+`FloatNode` or `BooleanNode` use a fixed size `struct` layout.
+"""
+
+__all__ = ['SchemaCodec']
+
+
+import hashlib
+import struct
+from datetime import datetime
+from schema_factory.errors import SchemaError
+from schema_factory.types import Integer, Float, Boolean, LazyMapping
+
+
+MAGIC = b'SF\x01'
+
+_HEADER = struct.Struct('<3sB8s')
+_LENGTH = struct.Struct('<I')
+_INT = struct.Struct('<q')
+_FLOAT = struct.Struct('<d')
+
+# Fixed layout records start with a flags bitmap holding two bits per field:
+# null, and (for integer fields) a `bool` value.
+_GENERIC, _FIXED = 0, 2
+
+_FIXED_FORMATS = {Integer: 'q', Float: 'd', Boolean: '?'}
+
+_DECODE_ERRORS = (struct.error, ValueError, UnicodeDecodeError, RecursionError)
+
+
+def _encode(value, out):
+    """Append the tagged encoding of `value` to the `out` bytearray.
+    """
+    value_type = type(value)
+
+    if value is None:
+        out += b'N'
+
+    elif value_type is bool:
+        out += b'T' if value else b'F'
+
+    elif value_type is int:
+        if -0x8000000000000000 <= value <= 0x7fffffffffffffff:
+            out += b'i'
+            out += _INT.pack(value)
+
+        else:
+            text = str(value).encode('ascii')
+            out += b'I'
+            out += _LENGTH.pack(len(text))
+            out += text
+
+    elif value_type is float:
+        out += b'd'
+        out += _FLOAT.pack(value)
+
+    elif isinstance(value, str):
+        text = value.encode('utf-8')
+        out += b's'
+        out += _LENGTH.pack(len(text))
+        out += text
+
+    elif isinstance(value, (bytes, bytearray)):
+        out += b'b'
+        out += _LENGTH.pack(len(value))
+        out += value
+
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        out += b'l'
+        out += _LENGTH.pack(len(value))
+
+        for item in value:
+            _encode(item, out)
+
+    elif isinstance(value, dict):
+        out += b'm'
+        out += _LENGTH.pack(len(value))
+
+        for key, item in value.items():
+            _encode(key, out)
+            _encode(item, out)
+
+    elif isinstance(value, datetime) and value.tzinfo is None:
+        text = value.isoformat().encode('ascii')
+        out += b't'
+        out += _LENGTH.pack(len(text))
+        out += text
+
+    elif value_type is LazyMapping:
+        if value.touched:
+            _encode(value.decoded, out)
+
+        else:
+            raw = value.raw.encode('utf-8') if isinstance(value.raw, str) else bytes(value.raw)
+            out += b'z'
+            out += _LENGTH.pack(len(raw))
+            out += raw
+
+    else:
+        raise SchemaError('Cannot encode value `{}` of type {}.'.format(value, value_type))
+
+
+def _decode(data, offset):
+    """Decode one tagged value of `data` at `offset`.
+
+    Returns:
+        A `(value, next_offset)` tuple.
+    """
+    tag = data[offset:offset + 1]
+    offset += 1
+
+    if tag == b'N':
+        return None, offset
+
+    if tag == b'T':
+        return True, offset
+
+    if tag == b'F':
+        return False, offset
+
+    if tag == b'i':
+        return _INT.unpack_from(data, offset)[0], offset + 8
+
+    if tag == b'd':
+        return _FLOAT.unpack_from(data, offset)[0], offset + 8
+
+    length = _LENGTH.unpack_from(data, offset)[0]
+    offset += 4
+
+    if tag == b'l':
+        items = []
+
+        for _ in range(length):
+            item, offset = _decode(data, offset)
+            items.append(item)
+
+        return items, offset
+
+    if tag == b'm':
+        mapping = {}
+
+        for _ in range(length):
+            key, offset = _decode(data, offset)
+            mapping[key], offset = _decode(data, offset)
+
+        return mapping, offset
+
+    if offset + length > len(data):
+        raise SchemaError('Invalid encoded value: truncated payload.')
+
+    chunk = bytes(data[offset:offset + length])
+    offset += length
+
+    if tag == b's':
+        return chunk.decode('utf-8'), offset
+
+    if tag == b'b':
+        return chunk, offset
+
+    if tag == b'I':
+        return int(chunk), offset
+
+    if tag == b't':
+        text = chunk.decode('ascii')
+        return datetime.strptime(text, '%Y-%m-%dT%H:%M:%S.%f' if '.' in text else '%Y-%m-%dT%H:%M:%S'), offset
+
+    if tag == b'z':
+        return LazyMapping(chunk), offset
+
+    raise SchemaError('Invalid encoded value tag {!r}.'.format(tag))
+
+
+class SchemaCodec(object):
+    """Binary codec of a schema class.
+
+    Use `SchemaCodec.of(schema)` to get the cached codec of a schema.
+
+    Args:
+        schema (SchemaType): The schema class.
+    """
+
+    __slots__ = ('schema', 'fields', 'fingerprint', 'mode', 'header', 'record')
+
+    def __init__(self, schema):
+        nodes = [schema._node_map[name] for name in schema.schema_nodes]
+        layout = '|'.join('{}:{}:{}:{}'.format(node.alias, node.__class__.__name__,
+                                               node.field_type.__class__.__name__, bool(node.is_array))
+                          for node in nodes)
+
+        formats = [None if node.is_array else _FIXED_FORMATS.get(type(node.field_type)) for node in nodes]
+
+        self.schema = schema
+        self.fields = tuple(schema.schema_nodes)
+        self.fingerprint = hashlib.sha1(layout.encode('utf-8')).digest()[:8]
+
+        if nodes and None not in formats:
+            self.mode = _FIXED
+            # Flags bitmap followed by the fixed size values.
+            self.record = struct.Struct('<{}s{}'.format((len(nodes) + 3) // 4, ''.join(formats)))
+
+        else:
+            self.mode = _GENERIC
+            self.record = None
+
+        self.header = _HEADER.pack(MAGIC, self.mode, self.fingerprint)
+
+    @classmethod
+    def of(cls, schema):
+        """Return the cached codec of `schema`.
+        """
+        codec = schema.__dict__.get('_codec')
+
+        if codec is None:
+            codec = schema._codec = cls(schema)
+
+        return codec
+
+    def _encode_record(self, instance, out):
+        storage = instance.__dict__
+
+        if self.mode == _GENERIC:
+            for name in self.fields:
+                _encode(storage.get(name), out)
+            return
+
+        flags = bytearray((len(self.fields) + 3) // 4)
+        values = []
+
+        for index, name in enumerate(self.fields):
+            value = storage.get(name)
+
+            if value is None:
+                flags[index // 4] |= 1 << (index % 4 * 2)
+                value = 0
+
+            elif value is True or value is False:
+                flags[index // 4] |= 2 << (index % 4 * 2)
+
+            values.append(value)
+
+        try:
+            out += self.record.pack(bytes(flags), *values)
+
+        except struct.error as error:
+            raise SchemaError('Cannot encode {} instance: {}'.format(self.schema.__name__, error))
+
+    def _decode_record(self, data, offset):
+        values = {}
+
+        if self.mode == _GENERIC:
+            for name in self.fields:
+                value, offset = _decode(data, offset)
+
+                if value is not None:
+                    values[name] = value
+
+            return values, offset
+
+        record = self.record.unpack_from(data, offset)
+        flags = record[0]
+
+        for index, name in enumerate(self.fields):
+            flag = flags[index // 4] >> (index % 4 * 2) & 3
+
+            if flag == 0:
+                values[name] = record[index + 1]
+
+            elif flag == 2:
+                values[name] = bool(record[index + 1])
+
+        return values, offset + self.record.size
+
+    def _instance(self, values, trusted):
+        if trusted:
+            return self.schema._from_cleaned(values)
+
+        return self.schema(**values)
+
+    def _check_header(self, data):
+        if len(data) < _HEADER.size:
+            raise SchemaError('Invalid {} payload: missing header.'.format(self.schema.__name__))
+
+        magic, mode, fingerprint = _HEADER.unpack_from(data, 0)
+
+        if magic != MAGIC or mode != self.mode or fingerprint != self.fingerprint:
+            raise SchemaError('Invalid {} payload: schema layout mismatch.'.format(self.schema.__name__))
+
+        return _HEADER.size
+
+    def _check_end(self, data, offset):
+        if offset != len(data):
+            raise SchemaError('Invalid {} payload: {} trailing bytes.'.format(self.schema.__name__, len(data) - offset))
+
+    def pack(self, instance):
+        """Encode a single schema instance.
+        """
+        out = bytearray(self.header)
+        self._encode_record(instance, out)
+
+        return bytes(out)
+
+    def unpack(self, data, trusted=True):
+        """Decode a single schema instance.
+
+        Args:
+            data (bytes): A `pack` payload.
+            trusted (bool): Skip revalidation of the decoded values.
+
+        Raises:
+            SchemaError, for payloads of a different schema layout and
+            truncated or corrupt payloads.
+        """
+        try:
+            values, offset = self._decode_record(data, self._check_header(data))
+
+        except _DECODE_ERRORS as error:
+            raise SchemaError('Invalid {} payload: {}'.format(self.schema.__name__, error))
+
+        self._check_end(data, offset)
+
+        return self._instance(values, trusted)
+
+    def pack_many(self, instances):
+        """Encode many instances into a single buffer.
+        """
+        instances = list(instances)
+        out = bytearray(self.header)
+        out += _LENGTH.pack(len(instances))
+
+        for instance in instances:
+            self._encode_record(instance, out)
+
+        return bytes(out)
+
+    def unpack_many(self, data, trusted=True):
+        """Decode a `pack_many` buffer into a list of instances.
+        """
+        offset = self._check_header(data)
+        records = []
+
+        try:
+            count = _LENGTH.unpack_from(data, offset)[0]
+            offset += _LENGTH.size
+
+            for _ in range(count):
+                values, offset = self._decode_record(data, offset)
+                records.append(values)
+
+        except _DECODE_ERRORS as error:
+            raise SchemaError('Invalid {} payload: {}'.format(self.schema.__name__, error))
+
+        self._check_end(data, offset)
+
+        return [self._instance(values, trusted) for values in records]
@@ -0,0 +1,303 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.collection` module.
+
+Provides an indexed in-memory collection of validated schema records. Records
+are stored as value tuples, in `schema_nodes` order, and looked up through
+hash indexes or sorted (range) indexes maintained on insert, update and delete.
+"""
+
+__all__ = ['SchemaCollection']
+
+
+from bisect import bisect_left, bisect_right, insort
+from schema_factory.errors import SchemaError
+from schema_factory.types import Integer, Float, String, Boolean, Timestamp
+
+
+_HASHABLE_TYPES = (Integer, Float, String, Boolean, Timestamp)
+
+_ORDERED_TYPES = (Integer, Float, Timestamp)
+
+# Sorts after every row id, so `(value, _LAST)` bounds all entries of `value`.
+_LAST = float('inf')
+
+
+def _sortable(value):
+    """Whether `value` has a place in a sorted index: not None and not NaN.
+    """
+    return value is not None and value == value
+
+
+class SchemaCollection(object):
+    """Indexed collection of schema records.
+
+    Rows are addressed by the integer id `insert` returns; ids of deleted rows
+    are not reused. Lookups return schema instances built from the stored
+    values without revalidation. Like schema instances, collections are not
+    synchronized.
+
+    Args:
+        schema (SchemaType): The schema class.
+        index_on (list): Scalar fields with a hash index, for `find`.
+        sorted_on (list): Integer, float or timestamp fields with a sorted
+            index, for `range`. Rows with a None or NaN value are left out of
+            the sorted index of that field.
+
+    Raises:
+        SchemaError, for unknown or unsupported index fields.
+
+    Examples:
+
+        >>> from schema_factory import schema_factory, StringNode, IntegerNode
+        >>> CitySchema = schema_factory('city', name=StringNode(), country_code=StringNode(),
+        ...                             people=IntegerNode())
+        >>> cities = SchemaCollection(CitySchema, index_on=['country_code'], sorted_on=['people'])
+        >>> cities.load([{'name': 'Athens', 'country_code': 'GR', 'people': 664046},
+        ...              {'name': 'Patras', 'country_code': 'GR', 'people': 167446},
+        ...              {'name': 'Rome', 'country_code': 'IT', 'people': 2873000}])
+        [0, 1, 2]
+        >>> [city.name for city in cities.find(country_code='GR')]
+        ['Athens', 'Patras']
+        >>> [city.name for city in cities.range('people', low=500000)]
+        ['Athens', 'Rome']
+    """
+
+    def __init__(self, schema, index_on=(), sorted_on=()):
+        self.schema = schema
+        self.fields = tuple(schema.schema_nodes)
+        self._positions = {name: position for position, name in enumerate(self.fields)}
+        self._defaults = tuple(schema._node_map[name].default for name in self.fields)
+        self._rows = []
+        self._count = 0
+        self._hash = {name: {} for name in self._check_fields(index_on, _HASHABLE_TYPES)}
+        self._sorted = {name: [] for name in self._check_fields(sorted_on, _ORDERED_TYPES)}
+
+    def _check_fields(self, names, types):
+        for name in names:
+            node = self.schema._node_map.get(name)
+
+            if node is None:
+                raise SchemaError('Invalid index field {} for {}.'.format(name, self.schema.__name__))
+
+            if node.is_array or not isinstance(node.field_type, types):
+                raise SchemaError('Cannot index {}.{}: unsupported node type.'.format(self.schema.__name__, name))
+
+        return names
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for row in self._rows:
+            if row is not None:
+                yield self._instance(row)
+
+    def _instance(self, row):
+        return self.schema._from_cleaned({name: value for name, value in zip(self.fields, row) if value is not None})
+
+    def _row(self, record):
+        """Validate a record (an instance or a dict) into a value tuple.
+        """
+        if not isinstance(record, self.schema):
+            if not isinstance(record, dict):
+                raise SchemaError('Invalid record for {}: {}'.format(self.schema.__name__, record))
+
+            record = self.schema(**record)
+
+        storage = record.__dict__
+
+        return tuple(default if value is None else value
+                     for value, default in zip((storage.get(name) for name in self.fields), self._defaults))
+
+    def _index(self, row_id, row):
+        positions = self._positions
+
+        for name, index in self._hash.items():
+            index.setdefault(row[positions[name]], set()).add(row_id)
+
+        for name, index in self._sorted.items():
+            value = row[positions[name]]
+
+            if _sortable(value):
+                insort(index, (value, row_id))
+
+    def _unindex(self, row_id, row, fields=None):
+        positions = self._positions
+
+        for name, index in self._hash.items():
+            if fields is None or name in fields:
+                value = row[positions[name]]
+                bucket = index[value]
+                bucket.discard(row_id)
+
+                if not bucket:
+                    del index[value]
+
+        for name, index in self._sorted.items():
+            value = row[positions[name]]
+
+            if _sortable(value) and (fields is None or name in fields):
+                entry = (value, row_id)
+                position = bisect_left(index, entry)
+
+                if position < len(index) and index[position] == entry:
+                    del index[position]
+
+                else:
+                    index.remove(entry)
+
+    def insert(self, record):
+        """Validate and add a record.
+
+        Returns:
+            The row id.
+        """
+        row = self._row(record)
+        row_id = len(self._rows)
+        self._rows.append(row)
+        self._count += 1
+        self._index(row_id, row)
+
+        return row_id
+
+    def load(self, records):
+        """Validate and add many records, rebuilding the sorted indexes once.
+
+        Records are all validated before any is added.
+
+        Returns:
+            The list of row ids.
+        """
+        rows = [self._row(record) for record in records]
+        first = len(self._rows)
+        positions = self._positions
+
+        self._rows.extend(rows)
+        self._count += len(rows)
+
+        for name, index in self._hash.items():
+            position = positions[name]
+
+            for row_id, row in enumerate(rows, first):
+                index.setdefault(row[position], set()).add(row_id)
+
+        for name, index in self._sorted.items():
+            position = positions[name]
+            index.extend((row[position], row_id) for row_id, row in enumerate(rows, first)
+                         if _sortable(row[position]))
+            index.sort()
+
+        return list(range(first, first + len(rows)))
+
+    def _get_row(self, row_id):
+        row = self._rows[row_id] if 0 <= row_id < len(self._rows) else None
+
+        if row is None:
+            raise SchemaError('Unknown {} row id: {}'.format(self.schema.__name__, row_id))
+
+        return row
+
+    def get(self, row_id):
+        """Return the instance of a row.
+        """
+        return self._instance(self._get_row(row_id))
+
+    def update(self, row_id, **changes):
+        """Validate `changes` and apply them to a row, updating only the affected indexes.
+        """
+        row = self._get_row(row_id)
+        schema = self.schema
+        positions = self._positions
+        values = list(row)
+
+        for name, value in changes.items():
+            if name not in positions:
+                raise SchemaError('Invalid Attributes {} for {}.'.format(schema.__name__, {name}))
+
+            value = schema._node_map[name].clean(value, schema)
+            values[positions[name]] = self._defaults[positions[name]] if value is None else value
+
+        updated = tuple(values)
+
+        self._unindex(row_id, row, changes)
+        self._rows[row_id] = updated
+
+        for name, index in self._hash.items():
+            if name in changes:
+                index.setdefault(updated[positions[name]], set()).add(row_id)
+
+        for name, index in self._sorted.items():
+            value = updated[positions[name]]
+
+            if name in changes and _sortable(value):
+                insort(index, (value, row_id))
+
+    def delete(self, row_id):
+        """Remove a row.
+        """
+        row = self._get_row(row_id)
+        self._unindex(row_id, row)
+        self._rows[row_id] = None
+        self._count -= 1
+
+    def ids(self, **criteria):
+        """Return the sorted ids of the rows matching every `field=value` criterion.
+
+        Criteria values are cleaned by their nodes first. Hash indexed fields
+        narrow the candidates; other fields are checked row by row.
+        """
+        schema = self.schema
+        positions = self._positions
+        wanted = {}
+
+        for name, value in criteria.items():
+            if name not in positions:
+                raise SchemaError('Invalid Attributes {} for {}.'.format(schema.__name__, {name}))
+
+            wanted[name] = schema._node_map[name].clean(value, schema)
+
+        buckets = [self._hash[name].get(value, ()) for name, value in wanted.items() if name in self._hash]
+
+        if buckets:
+            candidates = min(buckets, key=len)
+
+        else:
+            candidates = (row_id for row_id, row in enumerate(self._rows) if row is not None)
+
+        checks = [(positions[name], value) for name, value in wanted.items()]
+        rows = self._rows
+
+        return sorted(row_id for row_id in candidates
+                      if all(rows[row_id][position] == value for position, value in checks))
+
+    def find(self, **criteria):
+        """Return the instances matching every `field=value` criterion, in row id order.
+        """
+        return [self._instance(self._rows[row_id]) for row_id in self.ids(**criteria)]
+
+    def range(self, name, low=None, high=None):
+        """Return the instances with `low <= field <= high`, in field order.
+
+        Args:
+            name (str): A field with a sorted index.
+            low (object): The inclusive lower bound, unbounded when `None`.
+            high (object): The inclusive upper bound, unbounded when `None`.
+
+        Raises:
+            SchemaError, for fields without a sorted index and NaN bounds.
+        """
+        index = self._sorted.get(name)
+
+        if index is None:
+            raise SchemaError('No sorted index on {}.{}.'.format(self.schema.__name__, name))
+
+        node = self.schema._node_map[name]
+        low, high = (None if bound is None else node.clean(bound, self.schema) for bound in (low, high))
+
+        if not all(bound is None or _sortable(bound) for bound in (low, high)):
+            raise SchemaError('Invalid range bounds for {}.{}: NaN.'.format(self.schema.__name__, name))
+
+        start = 0 if low is None else bisect_left(index, (low, -1))
+        end = len(index) if high is None else bisect_right(index, (high, _LAST))
+
+        return [self._instance(self._rows[row_id]) for _, row_id in index[start:end]]
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.columns` module.
+
+Provides column oriented validation of record batches. Records are cast and
+validated straight into per field columns, without building per row dicts or
+schema instances. Scalar `IntegerNode` and `FloatNode` columns are stored as
+`array.array`; every column has a null mask.
+"""
+
+__all__ = ['ColumnBatch', 'validate_columns']
+
+
+import array
+from collections import OrderedDict
+from schema_factory.errors import SchemaError, SchemaNodeError
+from schema_factory.types import Integer, Float
+
+
+_TYPECODES = {Integer: 'q', Float: 'd'}
+
+
+class ColumnBatch(object):
+    """Column oriented batch of validated records.
+
+    Attributes:
+        schema (SchemaType): The schema class.
+        columns (OrderedDict): Field name / column, in `schema_nodes` order.
+            Numeric columns are `array.array` holding `0` for nulls, the rest
+            are lists holding `None`.
+        masks (OrderedDict): Field name / `bytearray`, `1` marking a null value.
+    """
+
+    __slots__ = ('schema', 'columns', 'masks', 'length')
+
+    def __init__(self, schema, columns, masks, length):
+        self.schema = schema
+        self.columns = columns
+        self.masks = masks
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def is_null(self, name, index):
+        return bool(self.masks[name][index])
+
+    def rows(self):
+        """Iterate the records as `{field: value}` OrderedDicts, nulls as `None`.
+        """
+        columns = list(self.columns.items())
+        masks = self.masks
+
+        for index in range(self.length):
+            yield OrderedDict((name, None if masks[name][index] else column[index]) for name, column in columns)
+
+
+def _column(node):
+    typecode = None if node.is_array else _TYPECODES.get(type(node.field_type))
+
+    return array.array(typecode) if typecode else []
+
+
+def validate_columns(schema, records, on_error=None):
+    """Validate records into a `ColumnBatch`.
+
+    Values are cast and validated as the schema constructor would, and missing
+    fields take the node default. `prepare_<field>` hooks need an instance and
+    are not applied.
+
+    Args:
+        schema (SchemaType): The schema class.
+        records (iterable): Dicts of raw values or schema instances.
+        on_error (callable): Called as `on_error(index, record, error)` for
+            invalid records, which are then skipped. Invalid records raise
+            `SchemaError` when omitted.
+
+    Returns:
+        A `ColumnBatch`.
+    """
+    shapes, casts, _ = schema._batch_plan()
+    names = schema.schema_nodes
+    nodes = [schema._node_map[name] for name in names]
+    fields = [(position, name, casts[name], node.default) for position, (name, node) in enumerate(zip(names, nodes))]
+    columns = OrderedDict((name, _column(node)) for name, node in zip(names, nodes))
+    masks = OrderedDict((name, bytearray()) for name in names)
+    sinks = [(columns[name], masks[name]) for name in names]
+    row = [None] * len(names)
+    length = 0
+
+    for index, record in enumerate(records):
+        try:
+            if isinstance(record, schema):
+                storage = record.__dict__
+
+                for position, name, _, default in fields:
+                    value = storage.get(name)
+                    row[position] = default if value is None else value
+
+            elif isinstance(record, dict):
+                error = schema._shape_error(shapes, record)
+
+                if error is not None:
+                    raise SchemaError(error)
+
+                for position, name, cast, default in fields:
+                    value = cast(record[name]) if name in record else None
+                    row[position] = default if value is None else value
+
+            else:
+                raise SchemaError('Invalid record for {}: {}'.format(schema.__name__, record))
+
+        except (SchemaError, SchemaNodeError) as error:
+            if on_error is None:
+                raise SchemaError('record {}: {}'.format(index, error.args[0]))
+
+            on_error(index, record, error)
+            continue
+
+        for position, (column, mask) in enumerate(sinks):
+            value = row[position]
+
+            if value is None:
+                mask.append(1)
+                column.append(0 if isinstance(column, array.array) else None)
+                continue
+
+            mask.append(0)
+
+            try:
+                column.append(value)
+
+            except OverflowError:
+                column = columns[names[position]] = column.tolist()
+                sinks[position] = (column, mask)
+                column.append(value)
+
+        length += 1
+
+    return ColumnBatch(schema, columns, masks, length)
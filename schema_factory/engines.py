@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.engines` module.
+
+Provides the validation engines of schema construction:
+
+- `reference`: the node by node `BaseNode.__set__` path, the semantics every
+  other engine must match.
+- `optimized`: the compiled batch plan of the schema (key shapes checked once
+  per shape, casts specialized per node type, see `readers.compile_cast`).
+- `differential`: the optimized engine, also running the reference engine on
+  a sample of the inputs and reporting diverging results.
+
+The engine is selected per schema class with its `__engine__` attribute, or
+globally with `set_engine`.
+"""
+
+__all__ = ['REFERENCE', 'OPTIMIZED', 'DIFFERENTIAL', 'set_engine', 'get_engine', 'engine_values']
+
+
+from schema_factory.errors import SchemaError, SchemaFactoryError
+
+
+REFERENCE, OPTIMIZED, DIFFERENTIAL = 'reference', 'optimized', 'differential'
+
+ENGINES = (REFERENCE, OPTIMIZED, DIFFERENTIAL)
+
+default_engine = REFERENCE
+
+
+def set_engine(engine):
+    """Select the engine of schema classes that do not set their own `__engine__`.
+    """
+    global default_engine
+
+    if engine not in ENGINES:
+        raise SchemaError('Invalid engine {}, expected one of {}.'.format(engine, ENGINES))
+
+    default_engine = engine
+
+
+def get_engine(schema=None):
+    """Return the engine of `schema`, or the global engine.
+    """
+    return (schema.__engine__ if schema is not None else None) or default_engine
+
+
+def reference_values(schema, data):
+    """Clean `data` with the reference engine into a `{field: value}` dict.
+    """
+    instance = schema.__new__(schema)
+    instance._reference_init(data)
+    storage = instance.__dict__
+
+    return {name: storage[name] for name in data}
+
+
+def optimized_values(schema, data):
+    """Clean `data` with the compiled batch plan into a `{field: value}` dict.
+    """
+    shapes, casts, _ = schema._batch_plan()
+    error = schema._shape_error(shapes, data)
+
+    if error is not None:
+        raise SchemaError(error)
+
+    return {name: casts[name](value) for name, value in data.items()}
+
+
+def _outcome(engine, schema, data):
+    try:
+        return engine(schema, data), None
+
+    except SchemaFactoryError as error:
+        return None, error
+
+
+def _same(reference, optimized):
+    reference_result, reference_error = reference
+    optimized_result, optimized_error = optimized
+
+    if reference_error is not None or optimized_error is not None:
+        return (type(reference_error) is type(optimized_error) and
+                reference_error.args == optimized_error.args)
+
+    return reference_result == optimized_result
+
+
+def differential_values(schema, data):
+    """Clean `data` with the optimized engine, checking a sample against the reference engine.
+
+    One in `differential_sample_rate` inputs runs both engines; a different
+    result or error increments `engine_divergences` and calls
+    `on_engine_divergence(schema, data, reference, optimized)` with the
+    `(values, error)` outcome of each engine. Sampled inputs return the
+    reference result.
+    """
+    optimized = _outcome(optimized_values, schema, data)
+    rate = schema.differential_sample_rate
+
+    if rate and schema._sample('_differential_counter', rate):
+        reference = _outcome(reference_values, schema, data)
+
+        if not _same(reference, optimized):
+            schema._increment('engine_divergences')
+            callback = schema.on_engine_divergence
+
+            if callback is not None:
+                callback(schema, data, reference, optimized)
+
+            optimized = reference
+
+    values, error = optimized
+
+    if error is not None:
+        raise error
+
+    return values
+
+
+_ENGINE_VALUES = {
+    REFERENCE: reference_values,
+    OPTIMIZED: optimized_values,
+    DIFFERENTIAL: differential_values,
+}
+
+
+def engine_values(schema, data, engine):
+    """Clean `data` into a `{field: value}` dict with `engine`.
+    """
+    try:
+        clean = _ENGINE_VALUES[engine]
+
+    except KeyError:
+        raise SchemaError('Invalid engine {} for {}, expected one of {}.'.format(engine, schema.__name__, ENGINES))
+
+    return clean(schema, data)
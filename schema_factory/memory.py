@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.memory` module.
+
+Provides deep memory size estimates of schema instances. Objects reachable
+from several places (shared defaults, interned strings, frozen values reused by
+`replace`) are counted once per report.
+"""
+
+__all__ = ['deep_sizeof', 'instance_size', 'memory_report']
+
+
+import sys
+from collections import OrderedDict
+from schema_factory.types import LazyMapping
+
+
+def deep_sizeof(value, seen):
+    """Estimate the deep size of `value` in bytes.
+
+    Args:
+        value (object): The object to measure.
+        seen (set): Ids of objects already counted, updated in place.
+
+    Returns:
+        The size of the objects reachable from `value` that are not in `seen`.
+    """
+    if id(value) in seen:
+        return 0
+
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+
+    if isinstance(value, (str, bytes, bytearray, int, float, bool)) or value is None:
+        return size
+
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += deep_sizeof(key, seen) + deep_sizeof(item, seen)
+
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += deep_sizeof(item, seen)
+
+    elif isinstance(value, LazyMapping):
+        size += deep_sizeof(value.raw, seen) + deep_sizeof(value.decoded, seen)
+
+    elif hasattr(value, '__dict__'):
+        size += deep_sizeof(value.__dict__, seen)
+
+    return size
+
+
+def instance_size(instance, seen=None):
+    """Estimate the deep size of a schema instance, including its node storage.
+    """
+    return deep_sizeof(instance, set() if seen is None else seen)
+
+
+def memory_report(schema, instances):
+    """Aggregate memory usage of schema instances.
+
+    Args:
+        schema (SchemaType): The schema class.
+        instances (iterable): Schema instances.
+
+    Returns:
+        An OrderedDict with the instance count, total and per instance bytes,
+        the instance / storage overhead and the bytes per field. Values shared
+        between instances are attributed to the first instance holding them.
+    """
+    seen = set()
+    fields = OrderedDict((name, 0) for name in schema.schema_nodes)
+    count = overhead = 0
+
+    for instance in instances:
+        count += 1
+        storage = instance.__dict__
+
+        for obj in (instance, storage):
+            if id(obj) not in seen:
+                seen.add(id(obj))
+                overhead += sys.getsizeof(obj)
+
+        for key, value in storage.items():
+            size = deep_sizeof(key, seen) + deep_sizeof(value, seen)
+
+            if key in fields:
+                fields[key] += size
+
+            else:
+                overhead += size
+
+    total = overhead + sum(fields.values())
+
+    return OrderedDict([
+        ('instances', count),
+        ('total_bytes', total),
+        ('bytes_per_instance', total / count if count else 0),
+        ('overhead_bytes', overhead),
+        ('field_bytes', fields),
+    ])
@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.migrations` module.
+
+Provides versioned schemas with compiled migrations between versions. Each
+version declares how it derives from the previous one (renamed fields, added
+field defaults, value converters; fields missing from the new schema are
+dropped). Migrations copy the stored values of unchanged nodes as they are and
+only recast fields whose node type changed.
+"""
+
+__all__ = ['SchemaVersions', 'Migration']
+
+
+import threading
+from schema_factory.errors import SchemaError
+from schema_factory.nodes import MappingNode
+from schema_factory.types import Schema, Union
+
+
+def same_node(source, target):
+    """Check whether values stored by `source` are valid `target` values as they are.
+    """
+    if source is target:
+        return True
+
+    if type(source) is not type(target) or type(source.field_type) is not type(target.field_type):
+        return False
+
+    if source.is_array != target.is_array or source.validators != target.validators:
+        return False
+
+    if isinstance(source.field_type, (Schema, Union)) and source.field_type.cast_type != target.field_type.cast_type:
+        return False
+
+    if isinstance(source, MappingNode):
+        if source.lazy != target.lazy:
+            return False
+
+        if (source.values is None) != (target.values is None):
+            return False
+
+        if source.values is not None and not same_node(source.values, target.values):
+            return False
+
+    return True
+
+
+class _Step(object):
+    """Compiled migration between two consecutive versions.
+    """
+
+    __slots__ = ('source', 'target', 'copies', 'recasts', 'defaults')
+
+    def __init__(self, source, target, renames=None, defaults=None, converters=None):
+        renames = dict(renames or {})
+        defaults = dict(defaults or {})
+        converters = dict(converters or {})
+        sources = {renames.get(name, name): name for name in source.schema_nodes}
+
+        unknown = set(renames).difference(source._node_names) | set(renames.values()).difference(target._node_names)
+        unknown |= set(defaults).union(converters).difference(target._node_names)
+
+        if unknown:
+            raise SchemaError('Invalid migration fields {} for {} -> {}.'.format(
+                unknown, source.__name__, target.__name__))
+
+        self.source = source
+        self.target = target
+        self.copies = []
+        self.recasts = []
+        self.defaults = {}
+
+        for name in target.schema_nodes:
+            target_node = target._node_map[name]
+            source_name = sources.get(name)
+
+            if name in defaults:
+                self.defaults[name] = target_node.clean(defaults[name], target)
+
+            if source_name is None:
+                continue
+
+            if name not in converters and same_node(source._node_map[source_name], target_node):
+                self.copies.append((name, source_name))
+
+            else:
+                self.recasts.append((name, source_name, target_node, converters.get(name)))
+
+    def apply(self, values):
+        target = self.target
+        migrated = dict(self.defaults)
+
+        for name, source_name in self.copies:
+            if source_name in values:
+                migrated[name] = values[source_name]
+
+        for name, source_name, node, converter in self.recasts:
+            if source_name in values:
+                value = values[source_name]
+                migrated[name] = node.clean(converter(value) if converter else value, target)
+
+        return migrated
+
+
+class Migration(object):
+    """Compiled migration function between two schema versions.
+
+    Calling it migrates a single record (a source schema instance or a dict of
+    its stored values) into a target schema instance.
+    """
+
+    __slots__ = ('source', 'target', 'steps')
+
+    def __init__(self, source, target, steps):
+        self.source = source
+        self.target = target
+        self.steps = tuple(steps)
+
+    def values(self, record, trusted=True):
+        """Migrate a record into a dict of cleaned target values.
+
+        Args:
+            record (object): A source schema instance or dict.
+            trusted (bool): Treat dicts as already cleaned source values;
+                otherwise they are validated by the source schema first.
+        """
+        if isinstance(record, dict) and not trusted:
+            record = self.source(**record)
+
+        storage = record if isinstance(record, dict) else record.__dict__
+        values = {name: storage[name] for name in self.source.schema_nodes if storage.get(name) is not None}
+
+        for step in self.steps:
+            values = step.apply(values)
+
+        if not self.target.required.issubset(values):
+            raise SchemaError('Missing Required Attributes: {}'.format(self.target.required.difference(values)))
+
+        return values
+
+    def __call__(self, record, trusted=True):
+        return self.target._from_cleaned(self.values(record, trusted=trusted))
+
+    def many(self, records, trusted=True):
+        """Migrate an iterable (batch or stream) of records lazily.
+        """
+        for record in records:
+            yield self(record, trusted=trusted)
+
+
+class SchemaVersions(object):
+    """Ordered versions of a schema.
+
+    Examples:
+
+        >>> from schema_factory import schema_factory, StringNode, IntegerNode
+        >>> versions = SchemaVersions('region')
+        >>> RegionV1 = versions.add(1, schema_factory('region_v1', title=StringNode(), people=StringNode()))
+        >>> RegionV2 = versions.add(2, schema_factory('region_v2', name=StringNode(), people=IntegerNode()),
+        ...                         renames={'title': 'name'})
+        >>> versions.migration(1, 2)(RegionV1(title='Athens', people='3')).to_dict
+        OrderedDict([('name', 'Athens'), ('people', 3)])
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self._versions = []
+        self._steps = {}
+        self._migrations = {}
+        self._lock = threading.Lock()
+
+    def add(self, version, schema, renames=None, defaults=None, converters=None):
+        """Add the next version of the schema.
+
+        Args:
+            version (int): The version, greater than every previous one.
+            schema (SchemaType): The schema class of this version.
+            renames (dict): Previous version field name / new field name mapping.
+            defaults (dict): Values for fields added in this version.
+            converters (dict): Field name / callable converting the previous
+                value before it is cast by the new node.
+
+        Returns:
+            The schema class.
+        """
+        with self._lock:
+            if self._versions and version <= self._versions[-1][0]:
+                raise SchemaError('Version {} of {} must be greater than {}.'.format(
+                    version, self.name, self._versions[-1][0]))
+
+            if self._versions:
+                self._steps[version] = _Step(self._versions[-1][1], schema, renames, defaults, converters)
+
+            self._versions.append((version, schema))
+
+        return schema
+
+    def get(self, version):
+        for known_version, schema in self._versions:
+            if known_version == version:
+                return schema
+
+        raise SchemaError('Unknown version {} of {}.'.format(version, self.name))
+
+    @property
+    def latest(self):
+        return self._versions[-1][0] if self._versions else None
+
+    def migration(self, source_version, target_version=None):
+        """Return the compiled (and cached) migration between two versions.
+
+        Args:
+            source_version (int): The stored records version.
+            target_version (int): Defaults to the latest version.
+        """
+        target_version = self.latest if target_version is None else target_version
+        key = (source_version, target_version)
+        migration = self._migrations.get(key)
+
+        if migration is None:
+            source, target = self.get(source_version), self.get(target_version)
+
+            if source_version > target_version:
+                raise SchemaError('Cannot downgrade {} from {} to {}.'.format(
+                    self.name, source_version, target_version))
+
+            steps = [self._steps[version] for version, _ in self._versions
+                     if source_version < version <= target_version]
+
+            migration = self._migrations[key] = Migration(source, target, steps)
+
+        return migration
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.ndjson` module.
+
+Provides resumable validation of large NDJSON files. The file is memory
+mapped, a line offset index is built (and optionally persisted), records are
+validated in chunks (optionally in worker processes, by offset range) and a
+checkpoint is written after every chunk so an interrupted run resumes where
+it stopped.
+"""
+
+__all__ = ['build_offsets', 'validate_ndjson']
+
+
+import array
+import hashlib
+import itertools
+import mmap
+import os
+from collections import deque
+from multiprocessing import Pool
+from schema_factory.errors import SchemaError, SchemaNodeError
+from schema_factory.registry import schema_definition, build_schema, _is_importable
+
+try:
+    import ujson
+
+except ImportError:  # pragma: no cover
+    import json as ujson
+
+
+# Bytes hashed at each end of a file for its signature.
+_SIGNATURE_SPAN = 65536
+
+
+def _open_map(path):
+    """Return `(file, mmap)` of `path`, `(file, None)` for empty files.
+    """
+    data_file = open(path, 'rb')
+
+    if os.fstat(data_file.fileno()).st_size == 0:
+        return data_file, None
+
+    return data_file, mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _signature(data_file, data):
+    """Return the signature of a mapped file: its size, mtime and a hash of its
+    first and last bytes.
+
+    Persisted indexes and checkpoints are only reused for the same signature,
+    so rewrites that keep the file size are detected as well.
+    """
+    stat = os.fstat(data_file.fileno())
+    digest = hashlib.sha1()
+
+    if data is not None:
+        digest.update(data[:_SIGNATURE_SPAN])
+        digest.update(data[-_SIGNATURE_SPAN:])
+
+    return '{}:{}:{}'.format(stat.st_size, stat.st_mtime_ns, digest.hexdigest())
+
+
+def build_offsets(data):
+    """Build the line offset index of a buffer.
+
+    Returns:
+        An `array('Q')` with the start offset of every line followed by the
+        buffer size, so line `i` spans `offsets[i]:offsets[i + 1]`.
+    """
+    size = len(data) if data is not None else 0
+    offsets = array.array('Q', [0] if size else [])
+    find = data.find if size else None
+    position = 0
+
+    while position < size:
+        newline = find(b'\n', position)
+
+        if newline == -1 or newline + 1 == size:
+            break
+
+        position = newline + 1
+        offsets.append(position)
+
+    offsets.append(size)
+
+    return offsets
+
+
+def _load_offsets(data, index_path, signature):
+    """Load a persisted offset index of `data`, rebuilding it when stale.
+
+    The index file holds the data file signature line followed by the offsets.
+    """
+    header = signature.encode('ascii') + b'\n'
+
+    if index_path and os.path.exists(index_path):
+        with open(index_path, 'rb') as index_file:
+            content = index_file.read()
+
+        if content.startswith(header):
+            offsets = array.array('Q')
+
+            try:
+                offsets.frombytes(content[len(header):])
+
+            except ValueError:
+                offsets = None
+
+            if offsets:
+                return offsets
+
+    offsets = build_offsets(data)
+
+    if index_path:
+        temporary_path = index_path + '.tmp'
+
+        with open(temporary_path, 'wb') as index_file:
+            index_file.write(header)
+            offsets.tofile(index_file)
+
+        os.replace(temporary_path, index_path)
+
+    return offsets
+
+
+def _load_checkpoint(checkpoint_path, signature):
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        with open(checkpoint_path) as checkpoint_file:
+            checkpoint = ujson.loads(checkpoint_file.read())
+
+        if checkpoint.get('signature') == signature:
+            return checkpoint
+
+    return {'signature': signature, 'line': 0, 'valid': 0, 'rejected': 0}
+
+
+def _save_checkpoint(checkpoint_path, checkpoint):
+    temporary_path = checkpoint_path + '.tmp'
+
+    with open(temporary_path, 'w') as checkpoint_file:
+        checkpoint_file.write(ujson.dumps(checkpoint))
+
+    os.replace(temporary_path, checkpoint_path)
+
+
+def _validate_line(schema, raw):
+    text = raw.decode('utf-8')
+    data = ujson.loads(text)
+
+    if not isinstance(data, dict):
+        raise SchemaError('Invalid record, expected a JSON object: {}'.format(text))
+
+    return schema(**data)
+
+
+def _validate_range(data, offsets, schema, start, end, first_line=1):
+    """Validate lines `start:end` of a buffer indexed by `offsets`.
+
+    Returns:
+        A list of `(line_number, instance or None, raw_line, error)` tuples,
+        blank lines excluded.
+    """
+    results = []
+
+    for index in range(start, end):
+        raw = data[offsets[index]:offsets[index + 1]].strip()
+
+        if not raw:
+            continue
+
+        try:
+            results.append((index + first_line, _validate_line(schema, raw), raw, None))
+
+        except (SchemaError, SchemaNodeError, ValueError) as error:
+            results.append((index + first_line, None, raw, error))
+
+    return results
+
+
+def _worker_range(args):
+    """Worker process entry point: validate the byte range of a chunk.
+
+    Valid records are returned as cleaned value dicts, cheap to send back to
+    the parent; errors are returned (pickled) as they are.
+    """
+    path, schema, first_line, low, high = args
+
+    if isinstance(schema, str):
+        schema = build_schema(schema)
+
+    with open(path, 'rb') as data_file:
+        with mmap.mmap(data_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            segment = data[low:high]
+
+    offsets = build_offsets(segment)
+    results = _validate_range(segment, offsets, schema, 0, len(offsets) - 1, first_line + 1)
+    names = schema._node_names
+
+    return [(line, None if instance is None else {name: value for name, value in instance.__dict__.items()
+                                                   if name in names},
+             raw, error)
+            for line, instance, raw, error in results]
+
+
+def _bounded_map(pool, function, tasks, limit):
+    """Like `pool.imap`, with at most `limit` tasks submitted ahead of the consumer.
+
+    Results are yielded in task order; a consumer slower than the workers
+    holds at most `limit` results in memory.
+    """
+    tasks = iter(tasks)
+    pending = deque(pool.apply_async(function, (task, )) for task in itertools.islice(tasks, limit))
+
+    while pending:
+        result = pending.popleft().get()
+        task = next(tasks, None)
+
+        if task is not None:
+            pending.append(pool.apply_async(function, (task, )))
+
+        yield result
+
+
+def validate_ndjson(path, schema, valid_sink, reject_sink, chunk_size=10000, index_path=None,
+                    checkpoint_path=None, workers=None):
+    """Validate an NDJSON file, one JSON object per line.
+
+    Progress is checkpointed after each chunk has reached the sinks, so a run
+    resumed after a crash replays at most the chunk it was processing.
+
+    Args:
+        path (str): The NDJSON file.
+        schema (SchemaType): The schema class of the records.
+        valid_sink (callable): Called as `valid_sink(instance)` for valid records.
+        reject_sink (callable): Called as `reject_sink(line_number, raw_line, error)`
+            for invalid records, `error` being the raised exception.
+        chunk_size (int): Lines per chunk; the checkpoint is written after each chunk.
+        index_path (str): Persist the line offset index there and reuse it on
+            later runs over the unchanged file.
+        checkpoint_path (str): Resume from, and write, a checkpoint there. A
+            checkpoint of a changed file is discarded.
+        workers (int): Validate chunks in that many worker processes. Records
+            still reach the sinks in file order, and at most `2 * workers`
+            chunks are validated ahead of them. The schema must be importable
+            or portable (see `schema_factory.registry`).
+
+    Returns:
+        A dict with the `lines`, `valid` and `rejected` counts and the line the
+        run `resumed` from.
+    """
+    data_file, data = _open_map(path)
+
+    try:
+        signature = _signature(data_file, data)
+        offsets = _load_offsets(data, index_path, signature)
+        lines = len(offsets) - 1
+        checkpoint = _load_checkpoint(checkpoint_path, signature)
+        resumed = checkpoint['line']
+        chunks = [(start, min(start + chunk_size, lines)) for start in range(resumed, lines, chunk_size)]
+
+        if workers:
+            worker_schema = schema if _is_importable(schema) else schema_definition(schema)
+            pool = Pool(workers)
+            results = _bounded_map(pool, _worker_range, ((path, worker_schema, start, offsets[start], offsets[end])
+                                                         for start, end in chunks), workers * 2)
+
+        else:
+            pool = None
+            results = (_validate_range(data, offsets, schema, start, end) for start, end in chunks)
+
+        try:
+            for (start, end), chunk in zip(chunks, results):
+                for line, instance, raw, error in chunk:
+                    if error is not None:
+                        checkpoint['rejected'] += 1
+                        reject_sink(line, raw, error)
+                        continue
+
+                    if pool is not None:
+                        instance = schema._from_cleaned(instance)
+
+                    checkpoint['valid'] += 1
+                    valid_sink(instance)
+
+                checkpoint['line'] = end
+
+                if checkpoint_path:
+                    _save_checkpoint(checkpoint_path, checkpoint)
+
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+    finally:
+        if data is not None:
+            data.close()
+
+        data_file.close()
+
+    return {'lines': lines, 'valid': checkpoint['valid'], 'rejected': checkpoint['rejected'], 'resumed': resumed}
@@ -5,25 +5,33 @@ Provides schema Node base classes.
 """
 
 __all__ = ['BaseNode', 'IntegerNode', 'FloatNode', 'StringNode', 'BooleanNode', 'TimestampNode', 'MappingNode',
-           'SchemaNode']
+           'SchemaNode', 'UnionNode']
 
 __authors__ = 'Papavassiliou Vassilis'
 __date__ = '2016-8-1'
 __version__ = '1.6'
 
 
-import weakref
+import copy
 from schema_factory.errors import NodeTypeError, SchemaNodeError, SchemaNodeValidatorError
-from schema_factory.types import (Integer, Float, String, Boolean, Timestamp, Schema, Mapping)
+from schema_factory.types import (Integer, Float, String, Boolean, Timestamp, Schema, Mapping, Union,
+                                  LazyMapping, freeze)
 
 
 class BaseNode(object):
     """Base Node descriptor class.
 
-    Provides an attribute set/get access with type validation.
+    Provides an attribute set/get access with type validation. Cleaned values
+    are stored in the owner instance `__dict__` under the node alias.
+
+    Thread safety: a node holds only configuration that is fixed once its schema
+    class is created, and keeps no per-instance state, so the same node may be
+    used concurrently from any number of threads and shared between schemas
+    (`SchemaType` binds a copy when a node is reused under a different name).
+    Schema instances themselves are not synchronized: mutate an instance from a
+    single thread, or use frozen schemas to share instances freely.
 
     Attributes:
-        _cache (object): A key/value instance that stores per instance values.
         alias(str): The alias of the attribute at the attached class.
     """
 
@@ -34,7 +42,6 @@ class BaseNode(object):
     base_required = None
 
     def __init__(self, field_type=None, alias='', array=False, validators=None, default=None, required=False):
-        self._cache = weakref.WeakKeyDictionary()
         self._validators = validators or []
         self._field_type = field_type
         self._array = array
@@ -62,6 +69,20 @@ class BaseNode(object):
     def validators(self):
         return (self.base_validators or []) + (self._validators or [])
 
+    def __set_name__(self, owner, name):
+        """Bind the node alias to its attribute name, for plain classes as well.
+
+        A node already bound under another name is replaced on `owner` by a
+        bound copy, so every node keeps its own storage key.
+        """
+        if not self.alias:
+            self.alias = name
+
+        elif self.alias != name:
+            node = copy.copy(self)
+            node.alias = name
+            setattr(owner, name, node)
+
     def __get__(self, instance, owner):
         """Python descriptor protocol `__get__` magic method.
 
@@ -70,14 +91,28 @@ class BaseNode(object):
             owner(object): Instance class.
 
         Returns:
-            The cached value for the class instance or None.
+            The stored value for the class instance or the node default.
         """
-        if not instance and owner:  # pragma: no cover
+        if instance is None:  # pragma: no cover
             return self
 
-        value = self._cache.get(instance) if self._cache.get(instance) is not None else self.default
+        return self._prepared(instance, owner, instance.__dict__.get(self.alias))
+
+    def _prepared(self, instance, owner, value):
+        """Apply the node default and the owner `prepare_<alias>` hook to a stored value.
+        """
+        if value is None:
+            value = self.default
+
+        hooks = getattr(owner, '_prepare_hooks', None)
 
-        if hasattr(instance, 'prepare_' + self.alias):
+        if hooks is None:
+            has_hook = hasattr(instance, 'prepare_' + self.alias)
+
+        else:
+            has_hook = self.alias in hooks
+
+        if has_hook:
             return getattr(instance, 'prepare_' + self.alias)(value)
 
         return value
@@ -89,32 +124,62 @@ class BaseNode(object):
             instance (object): The instance with descriptor attribute.
             value (object): The value for instance attribute.
         """
-        if value is None and self.default:
-            self._cache[instance] = self.default
+        storage = instance.__dict__
+        storage[self.alias] = self.clean(value, instance.__class__)
 
-        else:
-            try:
-                cleaned_value = self.field_value(value)
+        dirty = storage.get('_dirty')
 
-            except NodeTypeError as node_error:
-                raise SchemaNodeError('{}.{}: {}'.format(
-                    instance.__class__.__name__, self.alias, node_error.args[0])
-                )
+        if dirty is None:
+            if getattr(instance.__class__, '_tracks_dirty', False):
+                storage['_dirty'] = {self.alias}
 
-            try:
-                self.is_valid(cleaned_value)
-
-            except SchemaNodeValidatorError as error:
-                raise SchemaNodeError(
-                    '{}.{} Error for value `{}` : {}'.format(
-                        instance.__class__.__name__,
-                        self.alias,
-                        value,
-                        error.args[0]
-                    )
+        elif dirty is not False:
+            dirty.add(self.alias)
+
+        computed_values = storage.get('_computed')
+
+        if computed_values:
+            for name in getattr(instance.__class__, '_dependents', {}).get(self.alias, ()):
+                computed_values.pop(name, None)
+
+    def clean(self, value, owner):
+        """Cast and validate a value without storing it.
+
+        Args:
+            value (object): The raw value.
+            owner (type): The class the node is attached to, used for error messages.
+
+        Returns:
+            The cleaned value.
+
+        Raises:
+            SchemaNodeError, if casting or validation fails.
+        """
+        if value is None and self.default:
+            return self.default
+
+        try:
+            cleaned_value = self.field_value(value)
+
+        except NodeTypeError as node_error:
+            raise SchemaNodeError('{}.{}: {}'.format(
+                owner.__name__, self.alias, node_error.args[0])
+            )
+
+        try:
+            self.is_valid(cleaned_value)
+
+        except SchemaNodeValidatorError as error:
+            raise SchemaNodeError(
+                '{}.{} Error for value `{}` : {}'.format(
+                    owner.__name__,
+                    self.alias,
+                    value,
+                    error.args[0]
                 )
+            )
 
-            self._cache[instance] = cleaned_value
+        return cleaned_value
 
     @staticmethod
     def validator_exc(callback):
@@ -151,7 +216,10 @@ class BaseNode(object):
             return self._valid(value)
 
         if isinstance(value, (list, set, tuple)):
-            return all([self._valid(item) for item in value])
+            for item in value:
+                self._valid(item)
+
+            return True
 
         return self._valid(value)
 
@@ -199,14 +267,104 @@ class TimestampNode(BaseNode):
 
 class MappingNode(BaseNode):
     """Concrete MappingNode.
+
+    Args:
+        values (BaseNode): Optional node that casts and validates every mapping value.
+        lazy (bool): Keep JSON text / bytes input undecoded until first access.
+            Decoding errors then surface on access, and untouched values can be
+            serialized back as the original text (`serialize(raw_mappings=True)`).
     """
     base_field_type = Mapping()
 
+    def __init__(self, values=None, lazy=False, **kwargs):
+        super(MappingNode, self).__init__(**kwargs)
+        self.values = values
+        self.lazy = lazy
+
+    def __get__(self, instance, owner):
+        if instance is None:  # pragma: no cover
+            return self
+
+        value = instance.__dict__.get(self.alias)
+
+        if value.__class__ is LazyMapping:
+            if value.decoded is None:
+                decoded = self.clean(value, owner)
+                value.decoded = freeze(decoded) if getattr(owner, '__frozen__', False) else decoded
+
+            value = value.decoded
+
+        return self._prepared(instance, owner, value)
+
+    def _typed(self, mapping):
+        """Cast and validate mapping values against the `values` node in one pass.
+        """
+        values_node = self.values
+
+        if values_node is None:
+            return mapping
+
+        typed = {}
+
+        for key, item in mapping.items():
+            try:
+                typed[key] = cleaned_item = values_node.field_value(item)
+                values_node.is_valid(cleaned_item)
+
+            except (NodeTypeError, SchemaNodeValidatorError) as error:
+                raise NodeTypeError('key `{}`: {}'.format(key, error.args[0]))
+
+        return typed
+
+    def field_value(self, value):
+        if value.__class__ is LazyMapping:
+            return self._typed(self.field_type(value.raw))
+
+        if self.lazy and not self.is_array and isinstance(value, (str, bytes, bytearray)):
+            return LazyMapping(value)
+
+        if self.is_array and isinstance(value, (list, tuple, set)):
+            return [self._typed(self.field_type(item)) for item in value]
+
+        return self._typed(self.field_type(value))
+
+    def is_valid(self, value):
+        if value.__class__ is LazyMapping:
+            return True
+
+        return super(MappingNode, self).is_valid(value)
+
 
 class SchemaNode(BaseNode):
     """Concrete SchemaNode.
+
+    Arrays of `BaseSchema` items are cleaned in one batch by the schema class
+    (`BaseSchema._clean_many`), without building throwaway child instances.
     """
 
     def __init__(self, schema, **kwargs):   # pragma: no cover
         super(SchemaNode, self).__init__(**kwargs)
-        self._field_type = Schema(schema)
\ No newline at end of file
+        self._field_type = Schema(schema)
+
+    def field_value(self, value):
+        if self.is_array and isinstance(value, (list, tuple, set)):
+            clean_many = getattr(self.field_type.cast_type, '_clean_many', None)
+
+            if clean_many is not None:
+                return clean_many(value)
+
+        return super(SchemaNode, self).field_value(value)
+
+
+class UnionNode(BaseNode):
+    """Concrete UnionNode.
+
+    Args:
+        discriminator (str): The tag field that selects the schema.
+        mapping (dict): Tag value / schema class mapping.
+        schemas (list): Candidate schemas, tried in order when there is no discriminator.
+    """
+
+    def __init__(self, discriminator=None, mapping=None, schemas=None, **kwargs):
+        super(UnionNode, self).__init__(**kwargs)
+        self._field_type = Union(discriminator=discriminator, mapping=mapping, schemas=schemas)
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.projection` module.
+
+Provides partial validation of schema data restricted to a list of (dotted)
+field paths. Projection plans are compiled once per schema and field list.
+"""
+
+__all__ = ['ProjectionPlan']
+
+
+from collections import OrderedDict
+from schema_factory.errors import SchemaError
+from schema_factory.types import Schema
+
+
+class ProjectionPlan(object):
+    """Compiled projection of a schema on field paths.
+
+    Only the projected fields are cast and validated; nested paths such as
+    `location.lat` descend into `SchemaNode` values (and arrays of them) and
+    validate only the requested child fields. Required fields are enforced
+    only when they are projected.
+
+    Args:
+        schema (SchemaType): The schema class.
+        paths (list): Field names or dotted paths into nested schemas.
+
+    Raises:
+        SchemaError, for unknown fields or paths through non schema nodes.
+    """
+
+    __slots__ = ('schema', 'fields', 'nested')
+
+    def __init__(self, schema, paths):
+        heads = OrderedDict()
+
+        for path in paths:
+            head, _, rest = path.partition('.')
+
+            if head not in schema._node_names:
+                raise SchemaError('Invalid field for projection: {}'.format(path))
+
+            if not rest:
+                heads[head] = None
+
+            elif heads.setdefault(head, []) is not None:
+                heads[head].append(rest)
+
+        nested = {}
+
+        for head, rest in heads.items():
+            if rest is None:
+                continue
+
+            field_type = schema._node_map[head].field_type
+
+            if not isinstance(field_type, Schema):
+                raise SchemaError('Invalid field for projection: {}.{}'.format(head, rest[0]))
+
+            nested[head] = self.compile(field_type.cast_type, rest)
+
+        self.schema = schema
+        self.fields = tuple(heads)
+        self.nested = nested
+
+    @classmethod
+    def compile(cls, schema, paths):
+        """Return the cached plan of `schema` for `paths`.
+        """
+        plans = schema.__dict__.get('_projection_plans')
+
+        if plans is None:
+            plans = schema._projection_plans = {}
+
+        key = tuple(paths)
+        plan = plans.get(key)
+
+        if plan is None:
+            plan = plans[key] = cls(schema, key)
+
+        return plan
+
+    def _nested(self, name, node, value):
+        plan = self.nested[name]
+
+        if isinstance(value, plan.schema):
+            value = value.to_dict
+
+        if node.is_array and isinstance(value, (list, tuple, set)):
+            return [plan.apply(item.to_dict if isinstance(item, plan.schema) else item) for item in value]
+
+        return plan.apply(value)
+
+    def apply(self, data):
+        """Validate and materialize the projected fields of `data`.
+
+        Returns:
+            An OrderedDict of the projected fields, nested as requested.
+        """
+        schema = self.schema
+        node_map = schema._node_map
+        required = schema.required
+        nested = self.nested
+
+        if not isinstance(data, dict):
+            raise SchemaError('Invalid data for {} projection: {}'.format(schema.__name__, data))
+
+        values = {}
+
+        for name in self.fields:
+            value = data.get(name)
+
+            if value is None:
+                if name in required:
+                    raise SchemaError('Missing Required Attributes: {}'.format({name}))
+                continue
+
+            if name in nested:
+                values[name] = self._nested(name, node_map[name], value)
+
+            else:
+                values[name] = node_map[name].clean(value, schema)
+
+        instance = schema._from_cleaned(values)
+
+        return OrderedDict([(name, getattr(instance, name)) for name in self.fields])
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.readers` module.
+
+Provides bulk readers that build schema instances from tabular sources (CSV
+files, DB-API cursors). Column to node bindings are compiled once per source
+into a `RowPlan`.
+"""
+
+__all__ = ['RowPlan', 'compile_cast', 'read_csv', 'read_rows']
+
+
+import csv
+from schema_factory.errors import SchemaError, SchemaNodeError, SchemaNodeValidatorError
+from schema_factory.types import Integer, Float, String, Boolean, Timestamp
+
+
+_BOOLEANS = {'true': True, 'false': False}
+
+# Casts specialized for `str` input, keyed by exact NodeType class. They only
+# cover the common case; anything they reject goes through `BaseNode.clean`,
+# which either accepts the value or raises the canonical error.
+_STRING_CASTS = {
+    Integer: int,
+    Float: float,
+    String: str,
+    Boolean: lambda value: _BOOLEANS[value.lower()],
+    Timestamp: Timestamp.cast_callback,
+}
+
+
+def compile_cast(node, owner):
+    """Compile the cast callable of `node` for tabular and batch input.
+
+    Values that already have the node type (e.g. from a DB driver) skip
+    casting, strings use the specialized casts and anything else is cleaned
+    by the node itself.
+    """
+    field_type = node.field_type
+    fast_cast = None if node.is_array else _STRING_CASTS.get(type(field_type))
+
+    if fast_cast is None:
+        return lambda value: node.clean(value, owner)
+
+    native_type = field_type.cast_type
+    validators = node.validators
+
+    def cast(value):
+        value_type = type(value)
+
+        if value_type is native_type:
+            cleaned_value = value
+
+        elif value_type is str:
+            try:
+                cleaned_value = fast_cast(value)
+
+            except Exception:
+                return node.clean(value, owner)
+
+        else:
+            return node.clean(value, owner)
+
+        if validators:
+            try:
+                node.is_valid(cleaned_value)
+
+            except SchemaNodeValidatorError:
+                return node.clean(value, owner)
+
+        return cleaned_value
+
+    return cast
+
+
+class RowPlan(object):
+    """Positional column to node binding of a schema.
+
+    Args:
+        schema (SchemaType): The schema class.
+        columns (list): Column names, in row order.
+        empty (object): A value that marks a missing cell besides `None`.
+
+    Raises:
+        SchemaError, for unknown columns or missing required columns.
+    """
+
+    __slots__ = ('schema', 'columns', 'fields', 'empty')
+
+    def __init__(self, schema, columns, empty=None):
+        columns = tuple(columns)
+        unknown = set(columns).difference(schema._node_names)
+
+        if unknown:
+            raise SchemaError('Invalid Attributes {} for {}.'.format(schema.__name__, unknown))
+
+        if not schema.required.issubset(columns):
+            raise SchemaError('Missing Required Attributes: {}'.format(schema.required.difference(columns)))
+
+        self.schema = schema
+        self.columns = columns
+        self.empty = empty
+        self.fields = tuple(
+            (index, name, compile_cast(schema._node_map[name], schema), name in schema.required)
+            for index, name in enumerate(columns)
+        )
+
+    @classmethod
+    def compile(cls, schema, columns, empty=None):
+        """Return the cached plan of `schema` for `columns`.
+        """
+        plans = schema.__dict__.get('_row_plans')
+
+        if plans is None:
+            plans = schema._row_plans = {}
+
+        key = (tuple(columns), empty)
+        plan = plans.get(key)
+
+        if plan is None:
+            plan = plans[key] = cls(schema, columns, empty)
+
+        return plan
+
+    def clean(self, row):
+        """Cast and validate a row into a `{field: value}` dict.
+
+        Missing cells (`None` or `empty`) are left out so node defaults apply.
+
+        Raises:
+            SchemaError, SchemaNodeError on invalid rows.
+        """
+        if len(row) != len(self.columns):
+            raise SchemaError('Expected {} columns, got {}.'.format(len(self.columns), len(row)))
+
+        empty = self.empty
+        values = {}
+
+        for index, name, cast, required in self.fields:
+            value = row[index]
+
+            if value is None or value == empty:
+                if required:
+                    raise SchemaError('Missing Required Attributes: {}'.format({name}))
+                continue
+
+            values[name] = cast(value)
+
+        return values
+
+    def build(self, row):
+        """Build a schema instance from a row.
+        """
+        return self.schema._from_cleaned(self.clean(row))
+
+
+def read_csv(schema, csv_file, on_error=None, **reader_options):
+    """Stream schema instances from a CSV file with a header line.
+
+    Args:
+        schema (SchemaType): The schema class.
+        csv_file (file): An iterable of CSV lines.
+        on_error (callable): Called as `on_error(line_number, row, error)` for
+            invalid rows, which are then skipped. Invalid rows raise
+            `SchemaError` when omitted.
+        reader_options: Options passed to `csv.reader`.
+
+    Yields:
+        Schema instances.
+    """
+    reader = csv.reader(csv_file, **reader_options)
+    header = next(reader, None)
+
+    if header is None:
+        return
+
+    plan = RowPlan.compile(schema, header, empty='')
+    build = plan.build
+
+    for row in reader:
+        if not row:
+            continue
+
+        try:
+            yield build(row)
+
+        except (SchemaError, SchemaNodeError) as error:
+            if on_error is None:
+                raise SchemaError('line {}: {}'.format(reader.line_num, error.args[0]))
+
+            on_error(reader.line_num, row, error)
+
+
+def _fetch(rows, batch_size):
+    fetchmany = getattr(rows, 'fetchmany', None)
+
+    if fetchmany is None:
+        yield from rows
+        return
+
+    while True:
+        batch = fetchmany(batch_size)
+
+        if not batch:
+            return
+
+        yield from batch
+
+
+def read_rows(schema, rows, columns=None, as_dict=False, on_error=None, batch_size=1000):
+    """Stream schema instances from tuple rows, e.g. a DB-API cursor.
+
+    Args:
+        schema (SchemaType): The schema class.
+        rows (object): A DB-API cursor (fetched with `fetchmany`) or any iterable of sequences.
+        columns (list): Column names, in row order. Read from `rows.description` when omitted.
+        as_dict (bool): Yield `{field: value}` dicts of the cleaned, non NULL columns instead of instances.
+        on_error (callable): Called as `on_error(row_number, row, error)` for
+            invalid rows, which are then skipped. Invalid rows raise
+            `SchemaError` when omitted.
+        batch_size (int): The `fetchmany` batch size.
+
+    Yields:
+        Schema instances or dicts.
+    """
+    if columns is None:
+        description = getattr(rows, 'description', None)
+
+        if description is None:
+            raise SchemaError('Cannot read rows of {}: no columns given.'.format(schema.__name__))
+
+        columns = [column[0] for column in description]
+
+    plan = RowPlan.compile(schema, columns)
+    convert = plan.clean if as_dict else plan.build
+
+    for row_number, row in enumerate(_fetch(rows, batch_size), 1):
+        try:
+            yield convert(row)
+
+        except (SchemaError, SchemaNodeError) as error:
+            if on_error is None:
+                raise SchemaError('row {}: {}'.format(row_number, error.args[0]))
+
+            on_error(row_number, row, error)
@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+"""`schema_factory.registry` module.
+
+Provides a name / version keyed schema registry with a compact, portable
+schema definition format used for warm starts and for pickling instances of
+dynamically created schema classes.
+"""
+
+__all__ = ['SchemaRegistry', 'schema_definition', 'build_schema']
+
+
+import importlib
+import sys
+import threading
+from schema_factory.errors import SchemaError
+from schema_factory.nodes import BaseNode, SchemaNode, MappingNode, UnionNode
+from schema_factory.schema import SchemaType, BaseSchema
+
+try:
+    import ujson
+
+except ImportError:  # pragma: no cover
+    import json as ujson
+
+
+# definition string -> schema class, shared by the whole process.
+_built_schemas = {}
+_built_lock = threading.RLock()
+
+
+def _import_path(obj):
+    """Return the `module:qualname` path of `obj`, if it can be imported back.
+    """
+    path = '{}:{}'.format(obj.__module__, obj.__qualname__)
+
+    try:
+        resolved = _resolve(path)
+
+    except (ImportError, AttributeError):
+        resolved = None
+
+    if resolved is not obj:
+        raise SchemaError('Cannot export {!r}: it is not importable by name.'.format(obj))
+
+    return path
+
+
+def _resolve(path):
+    module_name, qualname = path.split(':')
+    obj = importlib.import_module(module_name)
+
+    for attr_name in qualname.split('.'):
+        obj = getattr(obj, attr_name)
+
+    return obj
+
+
+def _is_importable(cls):
+    module = sys.modules.get(cls.__module__)
+    obj = module
+
+    for attr_name in cls.__qualname__.split('.'):
+        obj = getattr(obj, attr_name, None)
+
+    return obj is cls
+
+
+def _is_json_value(value):
+    """Whether `value` round-trips through JSON unchanged.
+    """
+    if value is None or isinstance(value, (bool, int, str)):
+        return True
+
+    if isinstance(value, float):
+        return value == value and value not in (float('inf'), float('-inf'))
+
+    if isinstance(value, list):
+        return all(_is_json_value(item) for item in value)
+
+    if isinstance(value, dict):
+        return all(isinstance(key, str) and _is_json_value(item) for key, item in value.items())
+
+    return False
+
+
+def _check_portable(schema):
+    """Refuse schemas whose behaviour cannot be captured by node definitions.
+    """
+    for klass in schema.__mro__:
+        if klass is BaseSchema:
+            break
+
+        for attr_name, attr in vars(klass).items():
+            if attr_name.startswith('__') and attr_name.endswith('__'):
+                continue
+
+            if callable(attr) or isinstance(attr, (property, staticmethod, classmethod)):
+                if not isinstance(attr, BaseNode):
+                    raise SchemaError('Cannot export {}: attribute `{}` is not a schema node.'.format(
+                        schema.__name__, attr_name))
+
+
+def _node_definition(node):
+    options = {}
+
+    if node._array:
+        options['array'] = True
+
+    if node._required:
+        options['required'] = True
+
+    if node._default is not None:
+        if not _is_json_value(node._default):
+            raise SchemaError('Cannot export node {}: default {!r} is not a JSON value.'.format(
+                node.alias, node._default))
+
+        options['default'] = node._default
+
+    if node._validators:
+        options['validators'] = [_import_path(validator) for validator in node._validators]
+
+    if isinstance(node, SchemaNode):
+        options['schema'] = _definition(node._field_type.cast_type)
+
+    elif isinstance(node, UnionNode):
+        union = node._field_type
+        options['union'] = {
+            'discriminator': union.discriminator,
+            'mapping': {tag: _definition(schema) for tag, schema in union.mapping.items()},
+            'schemas': [] if union.mapping else [_definition(schema) for schema in union.schemas]
+        }
+
+    elif node._field_type is not None:
+        options['field_type'] = _import_path(node._field_type.__class__)
+
+    if isinstance(node, MappingNode):
+        if node.lazy:
+            options['lazy'] = True
+
+        if node.values is not None:
+            options['values'] = _node_definition(node.values)
+
+    return [node.alias, _import_path(node.__class__), options]
+
+
+def _definition(schema):
+    _check_portable(schema)
+
+    return {
+        'name': schema.__name__,
+        'frozen': bool(schema.__frozen__),
+        'nodes': [_node_definition(schema._node_map[name]) for name in schema.schema_nodes]
+    }
+
+
+def schema_definition(schema):
+    """Return the compact, portable definition string of a schema class.
+
+    The definition is computed once per class and cached on it.
+
+    Raises:
+        SchemaError, if the schema uses callables that are not importable by name.
+    """
+    definition = schema.__dict__.get('_definition')
+
+    if definition is None:
+        definition = ujson.dumps(_definition(schema), sort_keys=True)
+
+        with _built_lock:
+            _built_schemas.setdefault(definition, schema)
+
+        schema._definition = definition
+
+    return definition
+
+
+def _build_node(node_path, options):
+    options = dict(options)
+    node_cls = _resolve(node_path)
+
+    if 'validators' in options:
+        options['validators'] = [_resolve(path) for path in options['validators']]
+
+    if 'field_type' in options:
+        options['field_type'] = _resolve(options['field_type'])()
+
+    if 'values' in options:
+        options['values'] = _build_node(*options['values'][1:])
+
+    if 'schema' in options:
+        return node_cls(_build_cached(options.pop('schema')), **options)
+
+    if 'union' in options:
+        union = options.pop('union')
+        return node_cls(discriminator=union['discriminator'],
+                        mapping={tag: _build_cached(schema) for tag, schema in union['mapping'].items()},
+                        schemas=[_build_cached(schema) for schema in union['schemas']],
+                        **options)
+
+    return node_cls(**options)
+
+
+def _build(definition):
+    nodes = {}
+
+    for name, node_path, options in definition['nodes']:
+        nodes[name] = _build_node(node_path, options)
+
+    return SchemaType(str(definition['name']), (BaseSchema, ), nodes, frozen=definition['frozen'])
+
+
+def _build_cached(definition):
+    if not isinstance(definition, str):
+        definition = ujson.dumps(definition, sort_keys=True)
+
+    schema = _built_schemas.get(definition)
+
+    if schema is None:
+        with _built_lock:
+            schema = _built_schemas.get(definition)
+
+            if schema is None:
+                schema = _built_schemas[definition] = _build(ujson.loads(definition))
+                schema._definition = definition
+
+    return schema
+
+
+def build_schema(definition):
+    """Build (or reuse) the schema class described by a definition string.
+    """
+    return _build_cached(definition)
+
+
+def restore_instance(schema, state):
+    """Unpickle helper for schema instances, see `BaseSchema.__reduce__`.
+    """
+    if isinstance(schema, str):
+        schema = _build_cached(schema)
+
+    instance = schema.__new__(schema)
+    storage = instance.__dict__
+    storage.update(state)
+
+    if '_dirty' in storage:
+        storage['_dirty'] = set(storage['_dirty'])
+
+    if schema.__frozen__:
+        # Hashes are per process, recompute it.
+        instance._seal(())
+
+    return instance
+
+
+def reduce_instance(instance):
+    """Pickle helper for schema instances.
+
+    Importable schema classes are pickled by reference, dynamic ones (e.g. from
+    `schema_factory`) by their portable definition.
+
+    A definition is unpickled to the class already known for it in the
+    process: the class it was computed from, or the class rebuilt by
+    `build_schema` / `SchemaRegistry.load`. A spawned process that recreates a
+    dynamic schema with `schema_factory` only gets instances of that class if
+    it registered the class first (e.g. by calling `schema_definition` on it);
+    otherwise an equivalent class is rebuilt from the definition.
+    """
+    schema = instance.__class__
+    state = dict(instance.__dict__)
+    state.pop('_frozen_hash', None)
+    state.pop('_computed', None)
+
+    if _is_importable(schema):
+        return restore_instance, (schema, state)
+
+    return restore_instance, (schema_definition(schema), state)
+
+
+class SchemaRegistry(object):
+    """Name / version keyed schema registry.
+
+    Schemas registered before a worker pool forks are inherited by the workers
+    as they are; `export` / `load` persist compiled definitions on disk so
+    spawned processes can rebuild them without rerunning schema construction.
+    Instances pickled by definition unpickle to the loaded classes.
+
+    Examples:
+
+        >>> from schema_factory import schema_factory, FloatNode
+        >>> registry = SchemaRegistry()
+        >>> PointSchema = registry.register(schema_factory('point', lat=FloatNode(), lng=FloatNode()))
+        >>> registry.get('PointSchema') is PointSchema
+        True
+    """
+
+    def __init__(self):
+        self._schemas = {}
+        self._lock = threading.Lock()
+
+    def register(self, schema, name=None, version=1):
+        """Register a schema class.
+
+        Args:
+            schema (SchemaType): The schema class.
+            name (str): Registry name, defaults to the class name.
+            version (int): The schema version.
+
+        Returns:
+            The schema class, so `register` can be used as a class decorator.
+        """
+        with self._lock:
+            self._schemas[(name or schema.__name__, version)] = schema
+
+        return schema
+
+    def get(self, name, version=None):
+        """Lookup a schema, the latest version unless `version` is given.
+
+        Raises:
+            SchemaError, for unknown schemas.
+        """
+        if version is None:
+            versions = [v for (n, v) in self._schemas if n == name]
+            version = max(versions) if versions else None
+
+        try:
+            return self._schemas[(name, version)]
+
+        except KeyError:
+            raise SchemaError('Unknown schema {} (version: {}).'.format(name, version))
+
+    def __contains__(self, key):
+        return key in self._schemas
+
+    def __len__(self):
+        return len(self._schemas)
+
+    def dumps(self):
+        """Serialize every registered schema definition to a string.
+        """
+        return ujson.dumps([[name, version, ujson.loads(schema_definition(schema))]
+                            for (name, version), schema in sorted(self._schemas.items())])
+
+    def loads(self, data):
+        """Rebuild and register schemas from a `dumps` string.
+
+        Returns:
+            The list of rebuilt schema classes.
+        """
+        schemas = []
+
+        for name, version, definition in ujson.loads(data):
+            schemas.append(self.register(_build_cached(definition), name=name, version=version))
+
+        return schemas
+
+    def export(self, path):
+        """Write every registered schema definition to `path`.
+        """
+        with open(path, 'w') as export_file:
+            export_file.write(self.dumps())
+
+    def load(self, path):
+        """Rebuild and register schemas exported to `path`.
+        """
+        with open(path) as export_file:
+            return self.loads(export_file.read())
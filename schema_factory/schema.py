@@ -4,45 +4,268 @@
 Provides schema factory utilities.
 """
 
-__all__ = ['schema_factory', 'SchemaError', 'SchemaType', 'BaseSchema']
+__all__ = ['schema_factory', 'SchemaError', 'SchemaType', 'BaseSchema', 'computed']
 __authors__ = 'Papavassiliou Vassilis'
 __date__ = '2016-8-1'
 __version__ = '1.2'
 
 
+import copy
+import itertools
+import threading
 from collections import OrderedDict
-from schema_factory.errors import (SchemaError, SchemaNodeError)
+from schema_factory.errors import (SchemaError, SchemaNodeError, SchemaFactoryError, NodeTypeError)
+from schema_factory import engines
 from schema_factory.nodes import BaseNode
+from schema_factory.cache import is_impure
+from schema_factory.codec import SchemaCodec
+from schema_factory.columns import validate_columns
+from schema_factory.memory import instance_size, memory_report
+from schema_factory.projection import ProjectionPlan
+from schema_factory.readers import read_csv, read_rows, compile_cast
+from schema_factory.types import LazyMapping, freeze
 
 
 version = list(map(int, __version__.split('.')))
 
+# Guards the class level sampling counters and mismatch counts, which are
+# shared by every thread constructing instances of a schema.
+_counters_lock = threading.Lock()
+
+
+def _frozen_setattr(self, name, value):
+    raise SchemaError('Cannot set `{}`: {} instances are frozen.'.format(name, self.__class__.__name__))
+
+
+def _frozen_delattr(self, name):
+    raise SchemaError('Cannot delete `{}`: {} instances are frozen.'.format(name, self.__class__.__name__))
+
+
+def _frozen_eq(self, other):
+    if other.__class__ is not self.__class__:
+        return NotImplemented
+
+    if self.__dict__['_frozen_hash'] != other.__dict__['_frozen_hash']:
+        return False
+
+    return self._values() == other._values()
+
+
+def _frozen_hash(self):
+    return self.__dict__['_frozen_hash']
+
+
+class computed(property):
+    """Memoized property derived from node values.
+
+    The value is computed once per instance and kept in the instance storage
+    until a field it depends on is set, updated or replaced. Computed values
+    are serialized like properties.
+
+    Args:
+        depends_on (list): Node (or other computed) names the value derives
+            from, defaults to every node of the schema.
+
+    Examples:
+
+        >>> from schema_factory import FloatNode
+        >>> class AreaSchema(BaseSchema):
+        ...     width = FloatNode()
+        ...     height = FloatNode()
+        ...
+        ...     @computed(depends_on=['width', 'height'])
+        ...     def area(self):
+        ...         return self.width * self.height
+        ...
+        >>> rectangle = AreaSchema(width=2, height=3)
+        >>> rectangle.area
+        6.0
+        >>> rectangle.width = 4
+        >>> rectangle.serialize('area')
+        OrderedDict([('area', 12.0)])
+    """
+
+    def __init__(self, fget=None, depends_on=None):
+        super(computed, self).__init__(fget)
+        self.depends_on = None if depends_on is None else tuple(depends_on)
+        self.name = getattr(fget, '__name__', None)
+
+    def __call__(self, fget):
+        # Decorator with arguments: `@computed(depends_on=[...])`.
+        return self.__class__(fget, depends_on=self.depends_on)
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+
+        storage = instance.__dict__
+        values = storage.get('_computed')
+
+        if values is None:
+            values = storage['_computed'] = {}
+
+        try:
+            return values[self.name]
+
+        except KeyError:
+            value = values[self.name] = self.fget(instance)
+            return value
+
+
+def _invalidate(storage, dependents, fields):
+    """Drop the memoized computed values depending on `fields`.
+    """
+    values = storage.get('_computed')
+
+    if values:
+        for field in fields:
+            for name in dependents.get(field, ()):
+                values.pop(name, None)
+
 
 class SchemaType(type):
     """Base Type for Schema classes.
+
+    Accepts a `frozen` class keyword argument. Instances of frozen schema classes
+    are immutable and hashable; use `replace` to derive modified copies.
+    Subclasses of frozen schemas are frozen as well.
     """
 
-    def __new__(mcs, name, bases, attrs):
+    def __new__(mcs, name, bases, attrs, frozen=None):
+
+        attrs['_trusted_counter'] = itertools.count(1)
+
+        attrs['trusted_mismatches'] = 0
+
+        attrs['_differential_counter'] = itertools.count(1)
+
+        attrs['engine_divergences'] = 0
+
+        if frozen is not None:
+            attrs['__frozen__'] = frozen
+
+        if not isinstance(attrs.get('__frozen__', False), bool):
+            raise SchemaError('Invalid frozen flag of {}: {!r}, expected a bool.'.format(name, attrs['__frozen__']))
+
+        if '__frozen__' in attrs and not attrs['__frozen__'] and any(getattr(base, '__frozen__', False)
+                                                                     for base in bases):
+            raise SchemaError('Cannot unfreeze {}: it extends a frozen schema.'.format(name))
+
+        if attrs.get('__frozen__'):
+            attrs['__setattr__'] = _frozen_setattr
+            attrs['__delattr__'] = _frozen_delattr
+            attrs['__eq__'] = _frozen_eq
+            attrs['__hash__'] = _frozen_hash
+
+        cls = super(SchemaType, mcs).__new__(mcs, name, bases, attrs)
+
+        schema_nodes, property_names = mcs._resolve_members(cls)
+
+        cls.schema_nodes = sorted(schema_nodes.keys())
+
+        cls.property_nodes = sorted(property_names)
+
+        cls.data_nodes = set(sorted(cls.schema_nodes + cls.property_nodes))
+
+        cls.required = {node for node in schema_nodes.keys()
+                        if schema_nodes[node].required is True}
+
+        cls._node_map = schema_nodes
+
+        cls._node_names = frozenset(schema_nodes)
+
+        cls._prepare_hooks = frozenset(node for node in schema_nodes if hasattr(cls, 'prepare_' + node))
+
+        cls._dependents = mcs._computed_dependents(cls)
+
+        return cls
+
+    def __init__(cls, name, bases, attrs, frozen=None):
+        super(SchemaType, cls).__init__(name, bases, attrs)
+
+    @staticmethod
+    def _resolve_members(cls):
+        """Collect the nodes and property names of `cls` as attribute lookup resolves them.
+
+        Members are merged along `cls.__mro__`, so schema bases and plain mixins
+        alike contribute the node (or property) Python would return for each
+        name. Nodes declared outside a schema class are bound to their name
+        here; a node already bound under another name is replaced on `cls` by
+        a bound copy.
+
+        Raises:
+            SchemaError, for nodes named after a `BaseSchema` attribute.
+        """
+        base_schema = [klass for klass in cls.__mro__ if isinstance(klass, SchemaType)][-1]
+        members = {}
+
+        for klass in reversed(cls.__mro__):
+            members.update(vars(klass))
 
-        schema_nodes = {k: v for k, v in attrs.items() if
-                        isinstance(v, BaseNode)}
+        schema_nodes = {}
+        property_names = set()
 
-        property_nodes = {k: v for k, v in attrs.items() if
-                          isinstance(v, property) and k != 'to_dict'}
+        for attr_name, attr in members.items():
+            if isinstance(attr, BaseNode):
+                if attr_name in vars(base_schema):
+                    raise SchemaError('Invalid node name {} of {}: it shadows a schema attribute.'.format(
+                        attr_name, cls.__name__))
 
-        for node, attr in schema_nodes.items():
-            attr.alias = node
+                if attr.alias and attr.alias != attr_name:
+                    # The node is already bound under another name; bind a copy so
+                    # both schemas keep a stable alias.
+                    attr = copy.copy(attr)
+                    setattr(cls, attr_name, attr)
 
-        attrs['schema_nodes'] = sorted(schema_nodes.keys())
+                attr.alias = attr_name
+                schema_nodes[attr_name] = attr
 
-        attrs['property_nodes'] = sorted(property_nodes.keys())
+            elif isinstance(attr, property) and attr_name != 'to_dict':
+                property_names.add(attr_name)
 
-        attrs['data_nodes'] = set(sorted(attrs['schema_nodes'] + attrs['property_nodes']))
+        return schema_nodes, property_names
 
-        attrs['required'] = {node for node in schema_nodes.keys()
-                             if schema_nodes[node].required is True}
+    @staticmethod
+    def _computed_dependents(cls):
+        """Map each node to the computed properties to invalidate when it is set.
+        """
+        properties = {name: getattr(cls, name, None) for name in cls.property_nodes}
+        properties = {name: attr for name, attr in properties.items() if isinstance(attr, computed)}
+        resolved = {}
+
+        def resolve(name, path):
+            if name in resolved:
+                return resolved[name]
+
+            if name in path:
+                raise SchemaError('Circular computed dependency in {}: {}'.format(cls.__name__, name))
+
+            depends_on = properties[name].depends_on
+            fields = set()
+
+            for dependency in (cls.schema_nodes if depends_on is None else depends_on):
+                if dependency in properties:
+                    fields.update(resolve(dependency, path + (name,)))
+
+                elif dependency in cls._node_names:
+                    fields.add(dependency)
+
+                else:
+                    raise SchemaError('Invalid dependency {} of {}.{}'.format(dependency, cls.__name__, name))
+
+            resolved[name] = fields
+            return fields
 
-        return super(SchemaType, mcs).__new__(mcs, name, bases, attrs)
+        dependents = {}
+
+        for name in properties:
+            for field in resolve(name, ()):
+                dependents.setdefault(field, set()).add(name)
+
+        return {field: frozenset(names) for field, names in dependents.items()}
 
 
 class BaseSchema(object, metaclass=SchemaType):
@@ -61,24 +284,71 @@ class BaseSchema(object, metaclass=SchemaType):
         >>> point = PointSchema(lat='34.0', lng=0)
         >>> print(point.to_dict)
         OrderedDict([('lat', 34.0), ('lng', 0.0)])
+        >>> class FrozenPointSchema(BaseSchema, frozen=True):
+        ...     lat=FloatNode()
+        ...     lng=FloatNode()
+        ...
+        >>> frozen_point = FrozenPointSchema(lat=34, lng=0)
+        >>> {frozen_point: 'athens'}[FrozenPointSchema(lat=34, lng=0)]
+        'athens'
+        >>> frozen_point.replace(lng='1').lng
+        1.0
     """
+
+    __frozen__ = False
+
+    validation_cache = None
+
+    trusted_sample_rate = 0
+
+    on_trusted_mismatch = None
+
+    __engine__ = None
+
+    differential_sample_rate = 1
+
+    on_engine_divergence = None
+
+    # Nodes mark fields set after construction dirty, see `BaseNode.__set__`.
+    _tracks_dirty = True
+
     def __init__(self, **kwargs):
+        engine = self.__class__.__engine__ or engines.default_engine
+
+        if engine == engines.REFERENCE:
+            self._reference_init(kwargs)
+
+        else:
+            self.__dict__.update(engines.engine_values(self.__class__, kwargs, engine))
 
-        kwargs_set = set(kwargs)
+        if self.__frozen__:
+            self._seal()
 
-        if not self.required.issubset(kwargs_set):
+    def _reference_init(self, kwargs):
+        """Set `kwargs` node by node, the reference engine of `__init__`.
+        """
+        if not self.required.issubset(kwargs):
             raise SchemaError('Missing Required Attributes: {}'.format(
-                self.required.difference(kwargs_set)
+                self.required.difference(kwargs)
             ))
 
-        if not set(kwargs).issubset(set(self.schema_nodes)):
+        if not self._node_names.issuperset(kwargs):
             raise SchemaError('Invalid Attributes {} for {}.'.format(
                 self.__class__.__name__,
-                set(kwargs).difference(set(self.schema_nodes))
+                set(kwargs).difference(self._node_names)
             ))
 
+        node_map = self._node_map
+        storage = self.__dict__
+
+        # Fields set during construction are not dirty; the dirty set itself is
+        # only created by the first change after construction.
+        storage['_dirty'] = False
+
         for attr_name in kwargs:
-            setattr(self, attr_name, kwargs[attr_name])
+            node_map[attr_name].__set__(self, kwargs[attr_name])
+
+        del storage['_dirty']
 
     def __repr__(self):  # pragma: no cover
         return '<{} instance at: 0x{:x}>'.format(self.__class__, id(self))
@@ -89,27 +359,490 @@ class BaseSchema(object, metaclass=SchemaType):
             self.schema_nodes
         )
 
+    def _values(self):
+        """Stored node values, ordered as `schema_nodes`.
+        """
+        storage = self.__dict__
+        return tuple(storage.get(name) for name in self.schema_nodes)
+
+    def _seal(self, fields=None):
+        """Freeze stored values (and defaults) and precompute the instance hash.
+
+        Args:
+            fields (iterable): Restrict freezing to these fields, defaults to all nodes.
+        """
+        storage = self.__dict__
+        node_map = self._node_map
+
+        for name in (self.schema_nodes if fields is None else fields):
+            value = storage.get(name)
+            storage[name] = freeze(node_map[name].default if value is None else value)
+
+        storage['_frozen_hash'] = hash((self.__class__, self._values()))
+
+    def replace(self, **changes):
+        """Return a copy of the instance with `changes` applied.
+
+        Only the changed fields are cast and validated; the rest of the storage
+        is shared with the original instance.
+
+        Raises:
+            SchemaError, for unknown attributes.
+            SchemaNodeError, if a changed value fails validation.
+        """
+        cls = self.__class__
+
+        if not self._node_names.issuperset(changes):
+            raise SchemaError('Invalid Attributes {} for {}.'.format(
+                cls.__name__,
+                set(changes).difference(self._node_map)
+            ))
+
+        instance = cls.__new__(cls)
+        storage = instance.__dict__
+        storage.update(self.__dict__)
+        storage.pop('_frozen_hash', None)
+
+        for attr_name, value in changes.items():
+            storage[attr_name] = self._node_map[attr_name].clean(value, cls)
+
+        if '_computed' in storage:
+            storage['_computed'] = dict(storage['_computed'])
+            _invalidate(storage, cls._dependents, changes)
+
+        if cls.__frozen__:
+            instance._seal(changes)
+
+        else:
+            storage['_dirty'] = self.__dict__.get('_dirty', set()).union(changes)
+
+        return instance
+
+    def update(self, **patch):
+        """Apply a partial patch, validating only the patched fields.
+
+        The update is atomic: every patched value is cleaned before any of them
+        is stored, so a failing field leaves the instance untouched. Patched
+        fields are marked dirty.
+
+        Returns:
+            The updated instance.
+
+        Raises:
+            SchemaError, for unknown attributes or frozen instances.
+            SchemaNodeError, if a patched value fails validation.
+        """
+        cls = self.__class__
+
+        if cls.__frozen__:
+            raise SchemaError('{} instances are frozen, use `replace`.'.format(cls.__name__))
+
+        if not self._node_names.issuperset(patch):
+            raise SchemaError('Invalid Attributes {} for {}.'.format(
+                cls.__name__,
+                set(patch).difference(self._node_map)
+            ))
+
+        node_map = self._node_map
+        cleaned = {attr_name: node_map[attr_name].clean(value, cls) for attr_name, value in patch.items()}
+
+        storage = self.__dict__
+        storage.update(cleaned)
+        storage.setdefault('_dirty', set()).update(cleaned)
+        _invalidate(storage, cls._dependents, cleaned)
+
+        return self
+
+    def dirty_fields(self):
+        """Fields set or updated since construction or the last `mark_clean` call.
+        """
+        return frozenset(self.__dict__.get('_dirty', ()))
+
+    def mark_clean(self):
+        """Reset dirty field tracking.
+        """
+        if '_dirty' in self.__dict__:
+            self.__dict__['_dirty'].clear()
+
+    @classmethod
+    def _from_cleaned(cls, values):
+        """Build an instance from already cleaned `{field: value}` data.
+        """
+        instance = cls.__new__(cls)
+        instance.__dict__.update(values)
+
+        if cls.__frozen__:
+            instance._seal()
+
+        return instance
+
+    @classmethod
+    def _batch_plan(cls):
+        """Return the cached `(shape_errors, casts, simple)` batch cleaning plan of the class.
+
+        `simple` classes (not frozen, no prepare hooks, default `__init__` and
+        `to_dict`) can produce `to_dict` output without an instance.
+        """
+        plan = cls.__dict__.get('_batch')
+
+        if plan is None:
+            simple = (not cls.__frozen__ and not cls._prepare_hooks and cls.__init__ is BaseSchema.__init__ and
+                      cls.to_dict is BaseSchema.to_dict)
+            casts = {name: compile_cast(node, cls) for name, node in cls._node_map.items()}
+            plan = cls._batch = ({}, casts, simple)
+
+        return plan
+
+    @classmethod
+    def _shape_error(cls, shapes, item):
+        """Check the keys of an item once per key shape.
+        """
+        shape = frozenset(item)
+
+        try:
+            return shapes[shape]
+
+        except KeyError:
+            pass
+
+        if not cls.required.issubset(shape):
+            error = 'Missing Required Attributes: {}'.format(cls.required.difference(shape))
+
+        elif not cls._node_names.issuperset(shape):
+            error = 'Invalid Attributes {} for {}.'.format(cls.__name__, set(shape).difference(cls._node_names))
+
+        else:
+            error = None
+
+        if len(shapes) < 1024:
+            shapes[shape] = error
+
+        return error
+
+    @classmethod
+    def _clean_many(cls, items):
+        """Clean an array of nested schema items in a single pass.
+
+        Returns the `to_dict` output each item would produce as an instance.
+
+        Raises:
+            NodeTypeError, naming the index of the first invalid item.
+        """
+        shapes, casts, simple = cls._batch_plan()
+        node_map = cls._node_map
+        names = cls.schema_nodes
+        cleaned = []
+
+        for index, item in enumerate(items):
+            try:
+                if isinstance(item, cls):
+                    cleaned.append(item)
+                    continue
+
+                if not simple or not isinstance(item, dict):
+                    cleaned.append(cls(**item).to_dict)
+                    continue
+
+                error = cls._shape_error(shapes, item)
+
+                if error is not None:
+                    raise SchemaError(error)
+
+                values = {name: casts[name](value) for name, value in item.items()}
+                row = OrderedDict()
+
+                for name in names:
+                    value = values.get(name)
+                    row[name] = node_map[name].default if value is None else value
+
+                cleaned.append(row)
+
+            except Exception as error:
+                raise NodeTypeError('item {}: {}'.format(index, error.args[0] if error.args else error))
+
+        return cleaned
+
+    @classmethod
+    def from_trusted(cls, **data):
+        """Build an instance from already validated data, assigning storage only.
+
+        `data` must hold cleaned values (e.g. from `to_dict` or the codec) of
+        schema nodes only. When `trusted_sample_rate` is N > 0, one in N trusted
+        constructions is also validated; a failure or a differing result
+        increments `trusted_mismatches` and calls
+        `on_trusted_mismatch(schema, data, error)` instead of raising.
+        """
+        instance = cls._from_cleaned(data)
+        rate = cls.trusted_sample_rate
+
+        if rate and cls._sample('_trusted_counter', rate):
+            cls._check_trusted(instance, data)
+
+        return instance
+
+    @classmethod
+    def _sample(cls, counter, rate):
+        """Advance a class sampling counter, True for one in `rate` calls.
+        """
+        with _counters_lock:
+            return next(getattr(cls, counter)) % rate == 0
+
+    @classmethod
+    def _increment(cls, attr_name):
+        with _counters_lock:
+            setattr(cls, attr_name, getattr(cls, attr_name) + 1)
+
+    @classmethod
+    def _check_trusted(cls, instance, data):
+        try:
+            validated = cls(**data)
+
+        except SchemaFactoryError as error:
+            mismatch = error
+
+        else:
+            if validated._values() == instance._values():
+                return
+
+            mismatch = SchemaError('Trusted {} data differs from validated data: {}'.format(
+                cls.__name__, [name for name, trusted, value in zip(cls.schema_nodes, instance._values(),
+                                                                      validated._values()) if trusted != value]))
+
+        cls._increment('trusted_mismatches')
+
+        callback = cls.on_trusted_mismatch
+
+        if callback is not None:
+            callback(cls, data, mismatch)
+
+    @classmethod
+    def from_csv(cls, csv_file, on_error=None, **reader_options):
+        """Stream instances from a CSV file whose header names the schema nodes.
+
+        The header is bound to the nodes once, rows are validated positionally
+        with casts specialized for string input, and empty cells are treated as
+        missing values.
+
+        Args:
+            csv_file (file): An iterable of CSV lines.
+            on_error (callable): Called as `on_error(line_number, row, error)`
+                for invalid rows, which are skipped. Invalid rows raise
+                `SchemaError` when omitted.
+            reader_options: Options passed to `csv.reader`.
+        """
+        return read_csv(cls, csv_file, on_error=on_error, **reader_options)
+
+    @classmethod
+    def from_rows(cls, rows, columns=None, as_dict=False, on_error=None, batch_size=1000):
+        """Stream instances from tuple rows, e.g. a DB-API cursor.
+
+        Column positions are bound to the nodes once; values the driver already
+        returns with the node type skip casting and NULLs count as missing.
+
+        Args:
+            rows (object): A DB-API cursor (read with `fetchmany`) or an iterable of sequences.
+            columns (list): Column names, in row order. Read from `rows.description` when omitted.
+            as_dict (bool): Yield cleaned `{field: value}` dicts instead of instances.
+            on_error (callable): Called as `on_error(row_number, row, error)`
+                for invalid rows, which are skipped. Invalid rows raise
+                `SchemaError` when omitted.
+            batch_size (int): The `fetchmany` batch size.
+        """
+        return read_rows(cls, rows, columns=columns, as_dict=as_dict, on_error=on_error, batch_size=batch_size)
+
+    @classmethod
+    def validate_columns(cls, records, on_error=None):
+        """Validate records straight into a column oriented `ColumnBatch`.
+
+        No per record dicts or instances are built; scalar integer and float
+        fields are stored as `array.array` columns and every field has a null
+        mask. Node defaults apply, `prepare_<field>` hooks do not.
+
+        Args:
+            records (iterable): Dicts of raw values or instances.
+            on_error (callable): Called as `on_error(index, record, error)` for
+                invalid records, which are skipped. Invalid records raise
+                `SchemaError` when omitted.
+        """
+        return validate_columns(cls, records, on_error=on_error)
+
+    @classmethod
+    def from_ndjson(cls, path, valid_sink, reject_sink, chunk_size=10000, index_path=None,
+                    checkpoint_path=None, workers=None):
+        """Validate an NDJSON file in resumable chunks.
+
+        See `schema_factory.ndjson.validate_ndjson`.
+
+        Args:
+            path (str): The NDJSON file, memory mapped.
+            valid_sink (callable): Called with each valid instance.
+            reject_sink (callable): Called as `reject_sink(line_number, raw_line, error)`.
+            chunk_size (int): Lines per chunk and checkpoint.
+            index_path (str): Where to persist the line offset index.
+            checkpoint_path (str): Where to persist progress; an interrupted run resumes from it.
+            workers (int): Validate chunks in that many processes.
+        """
+        from schema_factory.ndjson import validate_ndjson
+        return validate_ndjson(path, cls, valid_sink, reject_sink, chunk_size=chunk_size, index_path=index_path,
+                               checkpoint_path=checkpoint_path, workers=workers)
+
+    @classmethod
+    def validate(cls, data):
+        """Validate `data` into an instance, through `validation_cache` if set.
+
+        Cached results are shared for frozen schemas and deep copied otherwise;
+        known invalid inputs raise their cached error. Schemas with validators
+        marked by `impure_validator` always validate.
+
+        Args:
+            data (dict): The raw input data.
+        """
+        cache = cls.validation_cache
+
+        if cache is None:
+            return cls(**data)
+
+        impure = cls.__dict__.get('_impure')
+
+        if impure is None:
+            impure = cls._impure = is_impure(cls)
+
+        if impure:
+            return cls(**data)
+
+        return cache.validate(cls, data)
+
+    @classmethod
+    def project(cls, data, fields):
+        """Validate and materialize only `fields` of `data`.
+
+        Fields may be dotted paths into nested schemas (`'location.lat'`); only
+        the requested subtree is cast and validated. The projection plan is
+        compiled once per field list.
+
+        Args:
+            data (dict): The raw input data.
+            fields (list): Field names or dotted paths.
+
+        Returns:
+            An OrderedDict of the projected fields.
+        """
+        return ProjectionPlan.compile(cls, fields).apply(data)
+
+    @classmethod
+    def pack(cls, instance):
+        """Encode an instance into the compact positional binary format.
+
+        The payload starts with a schema layout fingerprint, checked on decoding.
+        """
+        return SchemaCodec.of(cls).pack(instance)
+
+    @classmethod
+    def unpack(cls, data, trusted=True):
+        """Decode a `pack` payload; `trusted` payloads skip revalidation.
+        """
+        return SchemaCodec.of(cls).unpack(data, trusted=trusted)
+
+    @classmethod
+    def pack_many(cls, instances):
+        """Encode many instances into a single buffer.
+        """
+        return SchemaCodec.of(cls).pack_many(instances)
+
+    @classmethod
+    def unpack_many(cls, data, trusted=True):
+        """Decode a `pack_many` buffer into a list of instances.
+        """
+        return SchemaCodec.of(cls).unpack_many(data, trusted=trusted)
+
+    @classmethod
+    def memory_report(cls, instances):
+        """Aggregate deep memory usage of `instances`, per field.
+
+        See `schema_factory.memory.memory_report`.
+        """
+        return memory_report(cls, instances)
+
+    def memory_size(self):
+        """Estimate the deep size of the instance in bytes, node storage included.
+        """
+        return instance_size(self)
+
+    def __copy__(self):
+        """Shallow copy, cloning the instance storage without the pickle protocol.
+        """
+        if self.__frozen__:
+            return self
+
+        cls = self.__class__
+        instance = cls.__new__(cls)
+        storage = instance.__dict__
+        storage.update(self.__dict__)
+
+        for key in ('_dirty', '_computed'):
+            if key in storage:
+                storage[key] = storage[key].copy()
+
+        return instance
+
+    def __deepcopy__(self, memo):
+        """Deep copy of the instance storage; frozen instances are returned as they are.
+        """
+        if self.__frozen__:
+            return self
+
+        cls = self.__class__
+        instance = memo[id(self)] = cls.__new__(cls)
+        storage = instance.__dict__
+
+        for key, value in self.__dict__.items():
+            storage[key] = copy.deepcopy(value, memo)
+
+        return instance
+
+    def __reduce__(self):
+        from schema_factory.registry import reduce_instance
+        return reduce_instance(self)
+
     @property
     def to_dict(self):
         return OrderedDict([(k, getattr(self, k)) for k in self.schema_nodes])
 
-    def serialize(self, *fields):
+    def serialize(self, *fields, dirty_only=False, raw_mappings=False):
         """Serialize Nodes and attributes
+
+        Args:
+            fields (str): Restrict output to these nodes / properties.
+            dirty_only (bool): Emit only dirty fields, for delta synchronization.
+            raw_mappings (bool): Emit lazy mappings that were never accessed as
+                their original JSON text / bytes.
         """
         if fields:
             if not set(fields).issubset(self.data_nodes):
                 raise SchemaError('Invalid field for serialization: {}'.format(set(fields).difference(self.data_nodes)))
 
-            return OrderedDict([(k, getattr(self, k)) for k in fields])
+        else:
+            fields = self.data_nodes
+
+        if dirty_only:
+            dirty = self.__dict__.get('_dirty', ())
+            fields = [k for k in fields if k in dirty]
 
-        return OrderedDict([(k, getattr(self, k)) for k in self.data_nodes])
+        if raw_mappings:
+            storage = self.__dict__
+            return OrderedDict([(k, storage[k].raw if isinstance(storage.get(k), LazyMapping) and
+                                 not storage[k].touched else getattr(self, k)) for k in fields])
 
+        return OrderedDict([(k, getattr(self, k)) for k in fields])
 
-def schema_factory(schema_name, **schema_nodes):
+
+def schema_factory(schema_name, frozen=False, **schema_nodes):
     """Schema Validation class factory.
 
     Args:
         schema_name(str): The namespace of the schema.
+        frozen(bool): Create immutable, hashable schema instances. A node
+            passed as `frozen` declares a `frozen` field instead.
         schema_nodes(dict): The attr_names / SchemaNodes mapping of schema.
 
     Returns:
@@ -159,45 +892,10 @@ def schema_factory(schema_name, **schema_nodes):
         >>> region4 = RegionSchema(name='Athens', country_code='gr', keywords=['Acropolis', 'Mousaka', 434132])
     """
 
-    schema_dict = dict()
-    schema_dict.update(schema_nodes)
-
-    def cls_repr(self):  # pragma: no cover
-        return "<{} instance at: 0x{:x}>".format(self.__class__, id(self))
-
-    def cls_str(self):   # pragma: no cover
-        return "<{} instance, attributes:{}>".format(
-            self.__class__.__name__,
-            self.schema_nodes
-        )
-
-    def cls_init(self, **kwargs):
-
-        kwargs_set = set(kwargs)
-
-        if not self.required.issubset(kwargs_set):
-            raise SchemaError('Missing Required Attributes: {}'.format(
-                self.required.difference(kwargs_set)
-            ))
-
-        if not set(kwargs).issubset(set(self.schema_nodes)):
-            raise SchemaError('Invalid Attributes {} for {}.'.format(
-                self.__class__.__name__,
-                set(kwargs).difference(set(self.schema_nodes))
-            ))
-
-        for attr_name in kwargs:
-            setattr(self, attr_name, kwargs[attr_name])
-
-    def to_dict(self):
-        return OrderedDict([(k, getattr(self, k)) for k in self.schema_nodes])
-
-    schema_dict['to_dict'] = property(to_dict)
-    schema_dict['__init__'] = cls_init
-    schema_dict['__repr__'] = cls_repr
-    schema_dict['__str__'] = cls_str
+    if isinstance(frozen, BaseNode):
+        schema_nodes['frozen'], frozen = frozen, False
 
-    return SchemaType('{}Schema'.format(schema_name.title()), (), schema_dict)
+    return SchemaType('{}Schema'.format(schema_name.title()), (BaseSchema, ), dict(schema_nodes), frozen=frozen)
 
 
 if __name__ == '__main__':   # pragma: no cover
@@ -5,12 +5,12 @@ Provides type check / casting functionality for schema_factory classes.
 """
 
 __all__ = ('NodeType', 'Integer', 'Float', 'String', 'Boolean', 'Mapping',
-           'Timestamp', 'Schema')
+           'Timestamp', 'Schema', 'Union', 'FrozenDict', 'LazyMapping', 'freeze')
 
 
 from datetime import datetime
 from collections import OrderedDict
-from schema_factory.errors import NodeTypeError
+from schema_factory.errors import NodeTypeError, SchemaError
 
 try:
     import ujson
@@ -19,6 +19,67 @@ except ImportError:
     import json as ujson
 
 
+class FrozenDict(dict):
+    """Read-only, hashable dict used for mapping values of frozen schema instances.
+    """
+
+    def _immutable(self, *args, **kwargs):
+        raise SchemaError('Cannot modify a frozen mapping.')
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = _immutable
+
+    def __hash__(self):
+        return hash(frozenset(self.items()))
+
+    def __reduce__(self):
+        return self.__class__, (dict(self),)
+
+
+def freeze(value):
+    """Convert a cleaned node value into an immutable, hashable equivalent.
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+
+    if isinstance(value, (set, frozenset)):
+        return frozenset(freeze(item) for item in value)
+
+    if isinstance(value, dict) and not isinstance(value, FrozenDict):
+        return FrozenDict((k, freeze(v)) for k, v in value.items())
+
+    return value
+
+
+class LazyMapping(object):
+    """Undecoded JSON mapping, kept as its original text / bytes.
+
+    `decoded` holds the cleaned mapping once the owning node decodes it.
+    """
+
+    __slots__ = ('raw', 'decoded')
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.decoded = None
+
+    @property
+    def touched(self):
+        return self.decoded is not None
+
+    def __eq__(self, other):
+        return isinstance(other, LazyMapping) and self.raw == other.raw
+
+    def __hash__(self):
+        return hash(self.raw)
+
+    def __json__(self):
+        # Lets ujson embed the original text as is.
+        return self.raw.decode('utf-8') if isinstance(self.raw, (bytes, bytearray)) else self.raw
+
+    def __repr__(self):  # pragma: no cover
+        return '{}({!r})'.format(self.__class__.__name__, self.raw)
+
+
 class NodeType(object):
     """Base SchemaNode Type placeHolder.
     """
@@ -228,3 +289,109 @@ class Schema(NodeType):
     def __init__(self, cls_type=None):
         self._cast_type = cls_type
         super(Schema, self).__init__()
+
+
+class Union(NodeType):
+    """Union of schema classes.
+
+    With a `discriminator`, the schema is picked by a single `mapping` lookup
+    on the discriminator value. Without one, `schemas` are tried in order and
+    the winning schema is cached per key shape (the set of input keys), so
+    later inputs with the same shape try it first.
+
+    >>> from schema_factory import schema_factory, FloatNode
+    >>> Point = schema_factory('point', lat=FloatNode(), lng=FloatNode())
+    >>> Circle = schema_factory('circle', lat=FloatNode(), lng=FloatNode(), radius=FloatNode(required=True))
+    >>> shape_validator = Union(discriminator='type', mapping={'point': Point, 'circle': Circle})
+    >>> dict(shape_validator({'type': 'circle', 'lat': 1, 'lng': 2, 'radius': '3'}))
+    {'type': 'circle', 'lat': 1.0, 'lng': 2.0, 'radius': 3.0}
+    """
+
+    __slots__ = ('_cast_type', 'discriminator', 'mapping', 'schemas', '_shapes')
+
+    max_shapes = 1024
+
+    def __init__(self, discriminator=None, mapping=None, schemas=None):
+        if discriminator is not None and not mapping:
+            raise NodeTypeError('A discriminated union requires a `mapping`.')
+
+        self.discriminator = discriminator
+        self.mapping = dict(mapping or {})
+        self.schemas = tuple(schemas or self.mapping.values())
+        self._cast_type = self.schemas
+        # Key shape -> winning schema. Racing writers store equivalent entries.
+        self._shapes = {}
+        super(Union, self).__init__()
+
+    def _discriminated(self, value):
+        discriminator = self.discriminator
+
+        try:
+            tag = value[discriminator]
+
+        except (KeyError, TypeError):
+            raise NodeTypeError('Missing discriminator `{}` in {}.'.format(discriminator, value))
+
+        schema = self.mapping.get(tag)
+
+        if schema is None:
+            raise NodeTypeError('Invalid `{}` value `{}`, expected one of {}.'.format(
+                discriminator, tag, sorted(self.mapping)))
+
+        if discriminator in schema._node_names:
+            return schema(**value).to_dict
+
+        data = dict(value)
+        del data[discriminator]
+
+        cleaned = OrderedDict([(discriminator, tag)])
+        cleaned.update(schema(**data).to_dict)
+
+        return cleaned
+
+    def _ordered(self, value):
+        shape = frozenset(value)
+        cached = self._shapes.get(shape)
+        candidates = self.schemas if cached is None else (cached, ) + tuple(s for s in self.schemas if s is not cached)
+        errors = []
+
+        for schema in candidates:
+            try:
+                cleaned = schema(**value).to_dict
+
+            except Exception as error:
+                errors.append('{}: {}'.format(schema.__name__, error.args[0] if error.args else error))
+                continue
+
+            if cached is not schema and len(self._shapes) < self.max_shapes:
+                self._shapes[shape] = schema
+
+            return cleaned
+
+        raise NodeTypeError('No schema matches {}: {}'.format(value, '; '.join(errors)))
+
+    def cast_callback(self, value):
+        if self.discriminator is not None:
+            return self._discriminated(value)
+
+        if not isinstance(value, dict):
+            raise NodeTypeError('Invalid value `{}` for {}.'.format(value, self.schemas))
+
+        return self._ordered(value)
+
+    def validate(self, value):
+        """Override `validate` method, keeping the selected schema error.
+        """
+        if isinstance(value, self.schemas):
+            return value
+
+        try:
+            return self.cast_callback(value)
+
+        except NodeTypeError:
+            raise
+
+        except Exception as error:
+            raise NodeTypeError('Invalid value `{}`: {}'.format(value, error.args[0] if error.args else error))
+
+    __call__ = validate
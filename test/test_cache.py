@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.cache` module.
+"""
+
+import time
+import pytest
+from schema_factory import (schema_factory, IntegerNode, StringNode, SchemaNode, MappingNode, ValidationCache,
+                            SchemaError, SchemaNodeError, impure_validator)
+
+
+def test_validation_cache():
+    """Test cached valid and invalid results.
+    """
+
+    FrozenSchema = schema_factory('cached', frozen=True, name=StringNode(required=True), count=IntegerNode())
+    MutableSchema = schema_factory('mutable', tags=StringNode(array=True))
+
+    FrozenSchema.validation_cache = MutableSchema.validation_cache = cache = ValidationCache(maxsize=2)
+
+    first = FrozenSchema.validate({'name': 'foo', 'count': '1'})
+
+    assert FrozenSchema.validate({'count': '1', 'name': 'foo'}) is first
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    for _ in range(2):
+        with pytest.raises(SchemaNodeError):
+            FrozenSchema.validate({'name': 'foo', 'count': 'x'})
+
+    with pytest.raises(SchemaError):
+        FrozenSchema.validate({'count': 1})
+
+    assert (cache.hits, cache.misses) == (2, 3)
+    assert len(cache) == 2
+
+    mutable = MutableSchema.validate({'tags': ['a']})
+    mutable.tags.append('b')
+
+    assert MutableSchema.validate({'tags': ['a']}).tags == ['a']
+    assert MutableSchema.validate({'tags': {'a'}}).tags == ['a']
+
+    LambdaSchema = schema_factory('lambda', code=StringNode(validators=[lambda x: len(x) == 2]),
+                                  tags=StringNode(array=True))
+    LambdaSchema.validation_cache = ValidationCache()
+
+    first = LambdaSchema.validate({'code': 'gr', 'tags': ['a']})
+    second = LambdaSchema.validate({'code': 'gr', 'tags': ['a']})
+    second.update(code='it')
+    second.tags.append('b')
+
+    assert first is not second and first.code == 'gr' and first.tags == ['a']
+    assert first.dirty_fields() == frozenset() and second.dirty_fields() == frozenset(['code'])
+    assert LambdaSchema.validate({'code': 'gr', 'tags': ['a']}).to_dict == first.to_dict
+
+
+
+def test_validation_cache_typed_keys():
+    """Test inputs with the same JSON text but different types.
+    """
+
+    MetaSchema = schema_factory('meta', meta=MappingNode(), tags=StringNode(array=True))
+    MetaSchema.validation_cache = cache = ValidationCache()
+
+    assert MetaSchema.validate({'meta': {1: 'a'}}).meta == {1: 'a'}
+    assert MetaSchema.validate({'meta': {'1': 'a'}}).meta == {'1': 'a'}
+    assert MetaSchema.validate({'meta': {True: 'a'}}).meta == {True: 'a'}
+    assert MetaSchema.validate({'meta': {'a': (1, 2)}}).meta == {'a': (1, 2)}
+    assert MetaSchema.validate({'meta': {'a': [1, 2]}}).meta == {'a': [1, 2]}
+    assert MetaSchema.validate({'meta': {'a': 0.0}}).meta == {'a': 0.0}
+    assert str(MetaSchema.validate({'meta': {'a': -0.0}}).meta['a']) == '-0.0'
+    assert cache.hits == 0 and len(cache) == 7
+
+    assert MetaSchema.validate({'meta': {1: 'a'}}).meta == {1: 'a'}
+    assert cache.hits == 1
+
+def test_validation_cache_limits():
+    """Test TTL, size limits and impure validator bypass.
+    """
+
+    CountSchema = schema_factory('count', count=IntegerNode())
+    CountSchema.validation_cache = cache = ValidationCache(ttl=0.01, max_bytes=10 ** 6)
+
+    CountSchema.validate({'count': 1})
+    time.sleep(0.02)
+    CountSchema.validate({'count': 1})
+
+    assert cache.hits == 0 and 0 < cache.bytes < 10 ** 6
+
+    cache.max_bytes = 1
+    cache.clear()
+    CountSchema.validate({'count': 1})
+
+    assert len(cache) == 0 and cache.bytes == 0
+
+    calls = []
+
+    @impure_validator
+    def track(value):
+        calls.append(value)
+        return True
+
+    TrackedSchema = schema_factory('tracked', count=IntegerNode(validators=[track]))
+    ParentSchema = schema_factory('parent', child=SchemaNode(TrackedSchema))
+    ParentSchema.validation_cache = ValidationCache()
+
+    ParentSchema.validate({'child': {'count': 1}})
+    ParentSchema.validate({'child': {'count': 1}})
+
+    assert len(calls) == 2 and len(ParentSchema.validation_cache) == 0
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.codec` module.
+"""
+
+from datetime import datetime
+import pytest
+from schema_factory import (schema_factory, IntegerNode, FloatNode, BooleanNode, StringNode, TimestampNode,
+                            MappingNode, SchemaNode, SchemaError, SchemaNodeError)
+from schema_factory.codec import SchemaCodec
+
+
+@pytest.fixture(scope='module')
+def numeric_schema():
+    """Fixed layout schema fixture.
+    """
+    return schema_factory('numeric', count=IntegerNode(), ratio=FloatNode(), active=BooleanNode(default=None))
+
+
+@pytest.fixture(scope='module')
+def document_schema(numeric_schema):
+    """Generic layout schema fixture.
+    """
+    return schema_factory(
+        'document',
+        name=StringNode(validators=[lambda x: x != 'invalid']),
+        created=TimestampNode(),
+        tags=StringNode(array=True),
+        meta=MappingNode(),
+        blob=MappingNode(lazy=True),
+        stats=SchemaNode(numeric_schema),
+        big=IntegerNode()
+    )
+
+
+def test_fixed_layout(numeric_schema):
+    """Test struct packed layout of numeric schemas.
+    """
+
+    assert SchemaCodec.of(numeric_schema).record is not None
+
+    records = [numeric_schema(count=1, ratio=0.5, active=True), numeric_schema(ratio='2')]
+    payload = numeric_schema.pack_many(records)
+
+    assert len(payload) == 12 + 4 + 2 * (1 + 8 + 8 + 1)
+    assert [record.to_dict for record in numeric_schema.unpack_many(payload)] == [r.to_dict for r in records]
+    assert numeric_schema.unpack(numeric_schema.pack(records[1])).count is None
+
+    with pytest.raises(SchemaError):
+        numeric_schema.pack(numeric_schema(count=2 ** 70))
+
+
+def test_generic_layout(document_schema, numeric_schema):
+    """Test tagged layout round trips and fingerprint checks.
+    """
+
+    document = document_schema(
+        name='foo',
+        created='2016-01-28T15:30:26',
+        tags=['a', 'b'],
+        meta={'a': [1, 2.5, None, {'b': True}]},
+        blob='{"c": 1}',
+        stats={'count': 3},
+        big=2 ** 70
+    )
+
+    restored = document_schema.unpack(document_schema.pack(document))
+
+    assert restored.serialize('blob', raw_mappings=True)['blob'] == b'{"c": 1}'
+    assert restored.to_dict == document.to_dict
+    assert restored.created == datetime(2016, 1, 28, 15, 30, 26)
+
+    invalid = document_schema._from_cleaned({'name': 'invalid'})
+
+    assert document_schema.unpack(document_schema.pack(invalid)).name == 'invalid'
+
+    with pytest.raises(SchemaNodeError):
+        document_schema.unpack(document_schema.pack(invalid), trusted=False)
+
+    with pytest.raises(SchemaError):
+        numeric_schema.unpack(document_schema.pack(document))
+
+    with pytest.raises(SchemaError):
+        document_schema.unpack(b'')
+
+
+def test_corrupt_payloads(numeric_schema, document_schema):
+    """Test truncated payloads and boolean integer values.
+    """
+
+    flags_schema = schema_factory('flags', flag=IntegerNode(), count=IntegerNode())
+    flags = flags_schema.unpack(flags_schema.pack(flags_schema._from_cleaned({'flag': True, 'count': 1})))
+
+    assert flags.flag is True and flags.count == 1 and type(flags.count) is int
+
+    document = document_schema(name='foo', tags=['a'], meta={'a': 'b'}, stats={'count': 3})
+
+    for schema, payload in ((numeric_schema, numeric_schema.pack_many([numeric_schema(count=1)])),
+                            (document_schema, document_schema.pack(document))):
+        unpack = schema.unpack_many if schema is numeric_schema else schema.unpack
+
+        for end in range(12, len(payload)):
+            with pytest.raises(SchemaError):
+                unpack(payload[:end])
+
+        with pytest.raises(SchemaError):
+            unpack(payload + b'\x00')
+
+    with pytest.raises(SchemaError):
+        document_schema.unpack(document_schema.pack(document).replace(b'foo', b'\xff\xfe\xfd'))
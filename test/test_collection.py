@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.collection` module.
+"""
+
+from datetime import datetime
+import pytest
+from schema_factory import (schema_factory, IntegerNode, FloatNode, StringNode, TimestampNode, SchemaCollection,
+                            SchemaError, SchemaNodeError)
+
+
+@pytest.fixture(scope='module')
+def city_schema():
+    """Collection schema fixture.
+    """
+    return schema_factory(
+        schema_name='city',
+        name=StringNode(required=True),
+        country_code=StringNode(default='GR'),
+        people=IntegerNode(),
+        area=FloatNode(),
+        founded=TimestampNode(),
+        tags=StringNode(array=True)
+    )
+
+
+@pytest.fixture
+def cities(city_schema):
+    """Loaded collection fixture.
+    """
+    collection = SchemaCollection(city_schema, index_on=['country_code', 'name'], sorted_on=['people', 'founded'])
+    collection.load([
+        {'name': 'Athens', 'people': '664046', 'founded': '1834-01-01T00:00:00'},
+        {'name': 'Patras', 'people': 167446},
+        {'name': 'Rome', 'country_code': 'IT', 'people': 2873000, 'founded': '1871-01-01T00:00:00'},
+        {'name': 'Milan', 'country_code': 'IT'},
+    ])
+
+    return collection
+
+
+def test_collection_lookups(cities, city_schema):
+    """Test hash and range lookups.
+    """
+
+    assert len(cities) == 4
+    assert cities.ids(country_code='GR') == [0, 1]
+    assert cities.ids(country_code='IT', name='Rome') == [2]
+    assert cities.ids(people='167446') == [1]
+    assert cities.ids(country_code='FR') == []
+
+    athens = cities.get(0)
+
+    assert isinstance(athens, city_schema)
+    assert athens.to_dict == city_schema(name='Athens', people=664046, founded=datetime(1834, 1, 1)).to_dict
+
+    assert [city.name for city in cities.range('people', 167446, 664046)] == ['Patras', 'Athens']
+    assert [city.name for city in cities.range('people', low=700000)] == ['Rome']
+    assert [city.name for city in cities.range('founded', high='1850-01-01T00:00:00')] == ['Athens']
+    assert [city.name for city in cities] == ['Athens', 'Patras', 'Rome', 'Milan']
+
+    with pytest.raises(SchemaError):
+        cities.range('area')
+
+    with pytest.raises(SchemaError):
+        SchemaCollection(city_schema, index_on=['tags'])
+
+    with pytest.raises(SchemaError):
+        SchemaCollection(city_schema, sorted_on=['name'])
+
+
+def test_collection_changes(cities):
+    """Test incremental index maintenance on insert, update and delete.
+    """
+
+    row_id = cities.insert({'name': 'Naples', 'country_code': 'IT', 'people': 959000})
+
+    assert cities.ids(country_code='IT') == [2, 3, row_id]
+    assert [city.name for city in cities.range('people', 900000)] == ['Naples', 'Rome']
+
+    cities.update(1, country_code='IT', people=170000)
+
+    assert cities.ids(country_code='GR') == [0]
+    assert cities.ids(country_code='IT') == [1, 2, 3, row_id]
+    assert [city.people for city in cities.range('people', high=200000)] == [170000]
+
+    cities.delete(2)
+
+    assert len(cities) == 4
+    assert cities.ids(name='Rome') == []
+    assert [city.name for city in cities.range('people', 900000)] == ['Naples']
+
+    with pytest.raises(SchemaError):
+        cities.get(2)
+
+    with pytest.raises(SchemaNodeError):
+        cities.update(0, people='many')
+
+    assert cities.get(0).people == 664046
+
+
+def test_collection_nan(city_schema):
+    """Test NaN values staying out of sorted indexes.
+    """
+
+    collection = SchemaCollection(city_schema, index_on=['area'], sorted_on=['area'])
+    collection.load([{'name': 'a', 'area': 1.0}, {'name': 'b', 'area': 'nan'}, {'name': 'c', 'area': 0.5}])
+    collection.insert({'name': 'd', 'area': 'nan'})
+
+    assert [city.name for city in collection.range('area', 0, 2)] == ['c', 'a']
+
+    collection.delete(1)
+    collection.delete(0)
+    collection.update(3, area=0.7)
+
+    assert [city.name for city in collection.range('area', 0, 2)] == ['c', 'd']
+    assert len(collection) == 2
+
+    with pytest.raises(SchemaError):
+        collection.range('area', 'nan')
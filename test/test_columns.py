@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.columns` module.
+"""
+
+import array
+import pytest
+from schema_factory import schema_factory, IntegerNode, FloatNode, StringNode, SchemaError
+
+
+@pytest.fixture(scope='module')
+def metric_schema():
+    """Columnar schema fixture.
+    """
+    return schema_factory(
+        schema_name='metric',
+        name=StringNode(required=True),
+        value=FloatNode(),
+        count=IntegerNode(default=1, validators=[lambda x: x > 0]),
+        tags=StringNode(array=True)
+    )
+
+
+def test_validate_columns(metric_schema):
+    """Test validating records into columns with null masks.
+    """
+
+    records = [
+        {'name': 'cpu', 'value': '0.5', 'count': '3', 'tags': ['a', 'b']},
+        {'name': 'mem', 'count': 0},
+        metric_schema(name='disk', value=7),
+        {'value': 1.0},
+        {'name': 'net', 'value': 2},
+    ]
+    rejected = []
+
+    batch = metric_schema.validate_columns(records, on_error=lambda index, record, error: rejected.append(index))
+
+    assert rejected == [1, 3]
+    assert len(batch) == 3
+    assert list(batch.columns) == metric_schema.schema_nodes
+    assert batch['name'] == ['cpu', 'disk', 'net']
+    assert batch['value'] == array.array('d', [0.5, 7.0, 2.0])
+    assert batch['count'] == array.array('q', [3, 1, 1])
+    assert batch['tags'] == [['a', 'b'], None, None]
+    assert batch.masks['tags'] == bytearray([0, 1, 1])
+    assert batch.is_null('tags', 1) and not batch.is_null('value', 1)
+
+    assert list(batch.rows()) == [metric_schema(**record).to_dict for record in
+                                  (records[0], {'name': 'disk', 'value': 7}, records[4])]
+
+    with pytest.raises(SchemaError):
+        metric_schema.validate_columns(records)
+
+
+def test_validate_columns_overflow(metric_schema):
+    """Test integers out of the array range falling back to a list column.
+    """
+
+    batch = metric_schema.validate_columns([{'name': 'a', 'count': 2}, {'name': 'b', 'count': 2 ** 70}])
+
+    assert batch['count'] == [2, 2 ** 70]
+    assert batch.masks['count'] == bytearray([0, 0])
@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.engines` module.
+
+The engines are checked against each other on randomly generated (seeded)
+schemas and payloads.
+"""
+
+import random
+from datetime import datetime
+import pytest
+from schema_factory import (schema_factory, IntegerNode, FloatNode, StringNode, BooleanNode, TimestampNode,
+                            MappingNode, SchemaError, SchemaNodeError, set_engine)
+from schema_factory import engines
+
+
+NODE_TYPES = [IntegerNode, FloatNode, StringNode, BooleanNode, TimestampNode, MappingNode]
+
+DEFAULTS = {
+    IntegerNode: 7,
+    FloatNode: 0.5,
+    StringNode: 'default',
+    BooleanNode: True,
+    TimestampNode: datetime(2016, 1, 1),
+    MappingNode: {'a': 1},
+}
+
+SAMPLES = [
+    None, 0, 1, -12, 2 ** 70, 1.5, -0.25, True, False, '', ' ', '0', '12', ' 12 ', '-3', '1.5', '1e3', 'abc',
+    'true', 'FALSE', 'TrUe', 'null', '1', '2016-01-28T15:30:26.979', '2016-01-28 15:30:26', '2016-13-01 00:00:00',
+    '{"b": 2}', '{broken', '[1, 2]', [], ['1', '2'], ['x', 2.5], (3, '4'), {'a': 1}, {'nested': {'b': [1]}},
+    datetime(2016, 8, 1, 12, 30),
+]
+
+
+def short_value(value):
+    """Random schema validator."""
+    return len(str(value)) < 12
+
+
+def random_schema(rng, index):
+    nodes = {}
+
+    for position in range(rng.randint(1, 6)):
+        node_type = rng.choice(NODE_TYPES)
+        options = {}
+
+        if rng.random() < 0.3:
+            options['required'] = True
+
+        if rng.random() < 0.3:
+            options['default'] = DEFAULTS[node_type]
+
+        if rng.random() < 0.2 and node_type is not MappingNode:
+            options['array'] = True
+
+        if rng.random() < 0.3:
+            options['validators'] = [short_value]
+
+        nodes['field_{}'.format(position)] = node_type(**options)
+
+    return schema_factory('random_{}'.format(index), **nodes)
+
+
+def random_payload(rng, schema):
+    payload = {name: rng.choice(SAMPLES) for name in schema.schema_nodes if rng.random() < 0.8}
+
+    if rng.random() < 0.1:
+        payload['unknown'] = 1
+
+    return payload
+
+
+def outcome(engine, schema, payload):
+    try:
+        return engine(schema, dict(payload)), None
+
+    except Exception as error:
+        return None, (type(error), error.args)
+
+
+def test_engines_agree_on_random_schemas():
+    """Property test: the optimized engine matches the reference engine.
+    """
+
+    rng = random.Random(20160801)
+    failures = 0
+
+    for index in range(150):
+        schema = random_schema(rng, index)
+
+        for _ in range(30):
+            payload = random_payload(rng, schema)
+            reference = outcome(engines.reference_values, schema, payload)
+
+            assert outcome(engines.optimized_values, schema, payload) == reference, (schema.schema_nodes, payload)
+
+            if reference[1] is None:
+                schema.__engine__ = engines.OPTIMIZED
+                optimized_instance = schema(**payload)
+                schema.__engine__ = engines.REFERENCE
+
+                assert optimized_instance.to_dict == schema(**payload).to_dict
+
+            else:
+                failures += 1
+
+    # Both valid and invalid payloads are covered.
+    assert 0 < failures < 150 * 30
+
+
+def test_differential_engine():
+    """Test differential checking, sampling and engine selection.
+    """
+
+    calls = []
+
+    def flaky(value):
+        calls.append(value)
+        return len(calls) % 2 == 1
+
+    FlakySchema = schema_factory('flaky', name=StringNode(validators=[flaky]), count=IntegerNode())
+    divergences = []
+
+    FlakySchema.__engine__ = engines.DIFFERENTIAL
+    FlakySchema.on_engine_divergence = lambda schema, data, reference, optimized: divergences.append(
+        (data, reference[1] is None, optimized[1] is None))
+
+    # Optimized passes (odd call), reference fails (even call): the reference outcome wins.
+    with pytest.raises(SchemaNodeError):
+        FlakySchema(name='foo', count='1')
+
+    assert FlakySchema.engine_divergences == 1
+    assert divergences == [({'name': 'foo', 'count': '1'}, False, True)]
+
+    FlakySchema.differential_sample_rate = 0
+
+    assert FlakySchema(name='bar', count=2).count == 2
+    assert FlakySchema.engine_divergences == 1
+
+    PlainSchema = schema_factory('plain', count=IntegerNode())
+
+    try:
+        set_engine(engines.OPTIMIZED)
+
+        assert engines.get_engine(PlainSchema) == engines.OPTIMIZED
+        assert PlainSchema(count='3').count == 3
+
+        with pytest.raises(SchemaError):
+            set_engine('fastest')
+
+    finally:
+        set_engine(engines.REFERENCE)
+
+    PlainSchema.__engine__ = 'fastest'
+
+    with pytest.raises(SchemaError):
+        PlainSchema(count=1)
+
+    # A node named `engine` is a plain field, it does not select the engine.
+    CarSchema = schema_factory('car', engine=StringNode(default='v8'), seats=IntegerNode())
+    car = CarSchema(engine='electric', seats='4')
+
+    assert (car.engine, car.seats) == ('electric', 4)
+    assert engines.get_engine(CarSchema) == engines.REFERENCE
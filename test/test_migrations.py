@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.migrations` module.
+"""
+
+import pytest
+from schema_factory import (schema_factory, StringNode, IntegerNode, FloatNode, SchemaVersions, SchemaError,
+                            SchemaNodeError)
+
+
+@pytest.fixture(scope='module')
+def region_versions():
+    """Three versions of a region schema.
+    """
+    versions = SchemaVersions('region')
+
+    versions.add(1, schema_factory(
+        'region_v1',
+        title=StringNode(required=True),
+        population=StringNode(),
+        code=StringNode(),
+        legacy=StringNode()
+    ))
+    versions.add(2, schema_factory(
+        'region_v2',
+        name=StringNode(required=True),
+        population=IntegerNode(),
+        code=StringNode(),
+        area=FloatNode(required=True)
+    ), renames={'title': 'name'}, defaults={'area': '0'})
+    versions.add(3, schema_factory(
+        'region_v3',
+        name=StringNode(required=True),
+        population=IntegerNode(),
+        code=StringNode(),
+        area=FloatNode(required=True)
+    ), converters={'code': str.upper})
+
+    return versions
+
+
+def test_migration(region_versions):
+    """Test compiled migrations across versions.
+    """
+
+    RegionV1 = region_versions.get(1)
+    migration = region_versions.migration(1)
+
+    assert migration is region_versions.migration(1, 3)
+    assert [len(step.recasts) for step in migration.steps] == [1, 1]
+
+    region = migration(RegionV1(title='Athens', population='3', code='gr', legacy='x'))
+
+    assert region.__class__ is region_versions.get(3)
+    assert region.to_dict == region_versions.get(3)(name='Athens', population=3, code='GR', area=0).to_dict
+
+    records = [{'title': 'Ilion', 'population': '5'}, {'title': 'Patra'}]
+
+    assert [r.name for r in migration.many(records)] == ['Ilion', 'Patra']
+
+    with pytest.raises(SchemaNodeError):
+        region_versions.migration(1, 2)({'title': 'Ilion', 'population': 'many'})
+
+    with pytest.raises(SchemaError):
+        region_versions.migration(1, 2)({'population': '5'}, trusted=False)
+
+    with pytest.raises(SchemaError):
+        region_versions.migration(3, 1)
+
+    with pytest.raises(SchemaError):
+        region_versions.add(2, RegionV1)
+
+    with pytest.raises(SchemaError):
+        region_versions.add(4, RegionV1, renames={'foo': 'bar'})
@@ -0,0 +1,188 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.ndjson` module.
+"""
+
+import array
+import json
+import os
+import pytest
+from schema_factory import schema_factory, IntegerNode, StringNode, SchemaError
+from schema_factory.ndjson import build_offsets, validate_ndjson, _bounded_map
+
+
+@pytest.fixture(scope='module')
+def event_schema():
+    """NDJSON record schema fixture.
+    """
+    return schema_factory(
+        schema_name='event',
+        name=StringNode(required=True),
+        count=IntegerNode(default=0)
+    )
+
+
+@pytest.fixture
+def events_file(tmpdir):
+    """NDJSON file fixture: 10 records, 3 invalid, a blank line, no trailing newline.
+    """
+    lines = []
+
+    for index in range(10):
+        if index in (2, 7):
+            lines.append(json.dumps({'count': index}))
+
+        elif index == 5:
+            lines.append('{broken')
+
+        else:
+            lines.append(json.dumps({'name': 'event {}'.format(index), 'count': str(index)}))
+
+        if index == 4:
+            lines.append('')
+
+    path = tmpdir.join('events.ndjson')
+    path.write('\n'.join(lines))
+
+    return str(path)
+
+
+def test_build_offsets():
+    """Test the line offset index.
+    """
+
+    assert build_offsets(b'ab\ncd\n') == array.array('Q', [0, 3, 6])
+    assert build_offsets(b'ab\ncd') == array.array('Q', [0, 3, 5])
+    assert build_offsets(None) == array.array('Q', [0])
+
+
+def test_validate_ndjson(event_schema, events_file, tmpdir):
+    """Test chunked validation with valid and reject sinks.
+    """
+
+    valid, rejected = [], []
+    index_path = str(tmpdir.join('events.idx'))
+
+    result = validate_ndjson(events_file, event_schema, valid.append,
+                             lambda line, raw, error: rejected.append(line),
+                             chunk_size=3, index_path=index_path)
+
+    assert result == {'lines': 11, 'valid': 7, 'rejected': 3, 'resumed': 0}
+    assert [instance.count for instance in valid] == [0, 1, 3, 4, 6, 8, 9]
+    assert rejected == [3, 7, 9]
+
+    result = event_schema.from_ndjson(events_file, valid.append, lambda *args: None, index_path=index_path)
+
+    assert result['valid'] == 7 and len(valid) == 14
+
+
+def test_validate_ndjson_resume(event_schema, events_file, tmpdir):
+    """Test resuming an interrupted run from its checkpoint.
+    """
+
+    checkpoint_path = str(tmpdir.join('events.checkpoint'))
+    valid = []
+
+    def failing_sink(instance):
+        if instance.count == 6:
+            raise RuntimeError('crash')
+
+        valid.append(instance.count)
+
+    with pytest.raises(RuntimeError):
+        validate_ndjson(events_file, event_schema, failing_sink, lambda *args: None,
+                        chunk_size=3, checkpoint_path=checkpoint_path)
+
+    assert valid == [0, 1, 3, 4]
+
+    result = validate_ndjson(events_file, event_schema, lambda instance: valid.append(instance.count),
+                             lambda *args: None, chunk_size=3, checkpoint_path=checkpoint_path)
+
+    assert result == {'lines': 11, 'valid': 7, 'rejected': 3, 'resumed': 6}
+    assert valid == [0, 1, 3, 4, 6, 8, 9]
+
+
+def test_validate_ndjson_stale(event_schema, events_file, tmpdir):
+    """Test discarding the index and checkpoint of a file rewritten to the same size.
+    """
+
+    index_path = str(tmpdir.join('events.idx'))
+    checkpoint_path = str(tmpdir.join('events.checkpoint'))
+    names = []
+
+    def failing_sink(instance):
+        if instance.count == 6:
+            raise RuntimeError('crash')
+
+    with pytest.raises(RuntimeError):
+        validate_ndjson(events_file, event_schema, failing_sink, lambda *args: None, chunk_size=3,
+                        index_path=index_path, checkpoint_path=checkpoint_path)
+
+    with open(events_file, 'rb') as data_file:
+        content = data_file.read()
+
+    stat = os.stat(events_file)
+
+    # Same size, same mtime, lines moved: `{broken` is now the first line.
+    lines = content.split(b'\n')
+    lines.insert(0, lines.pop(6))
+
+    with open(events_file, 'wb') as data_file:
+        data_file.write(b'\n'.join(lines))
+
+    os.utime(events_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    result = validate_ndjson(events_file, event_schema, lambda instance: names.append(instance.name),
+                             lambda *args: None, chunk_size=3, index_path=index_path,
+                             checkpoint_path=checkpoint_path)
+
+    assert result == {'lines': 11, 'valid': 7, 'rejected': 3, 'resumed': 0}
+    assert names[0] == 'event 0' and len(names) == 7
+
+
+def test_validate_ndjson_workers(event_schema, events_file):
+    """Test validating chunks in worker processes.
+    """
+
+    valid, rejected, errors = [], [], []
+
+    result = validate_ndjson(events_file, event_schema, valid.append,
+                             lambda line, raw, error: rejected.append((line, raw, error.__class__)),
+                             chunk_size=4, workers=2)
+
+    assert result['valid'] == 7
+    assert [instance.name for instance in valid][:2] == ['event 0', 'event 1']
+
+    # Both modes hand the same exceptions to the reject sink.
+    validate_ndjson(events_file, event_schema, lambda instance: None,
+                    lambda line, raw, error: errors.append((line, raw, error.__class__)))
+
+    assert rejected == errors
+    assert [line for line, _, _ in rejected] == [3, 7, 9]
+    assert rejected[0][1:] == (b'{"count": 2}', SchemaError)
+    assert issubclass(rejected[1][2], ValueError) and rejected[1][1] == b'{broken'
+
+
+def test_bounded_map():
+    """Test the number of chunks submitted ahead of the sinks.
+    """
+
+    class Result(object):
+        def __init__(self, value):
+            self.value = value
+
+        def get(self):
+            return self.value
+
+    class RecordingPool(object):
+        submitted = 0
+
+        def apply_async(self, function, args):
+            self.submitted += 1
+            return Result(function(*args))
+
+    pool = RecordingPool()
+    results = _bounded_map(pool, lambda task: task * 2, range(10), 3)
+
+    assert pool.submitted == 0
+    assert next(results) == 0 and pool.submitted == 4
+    assert list(results) == [2 * task for task in range(1, 10)] and pool.submitted == 10
@@ -4,7 +4,10 @@
 
 
 import pytest
-from schema_factory.nodes import BaseNode, Integer
+from schema_factory import BaseSchema
+from collections import OrderedDict
+from schema_factory.nodes import (BaseNode, Integer, IntegerNode, FloatNode, StringNode, MappingNode, SchemaNode,
+                                 UnionNode)
 from schema_factory.errors import SchemaNodeError
 
 
@@ -43,3 +46,132 @@ def test_base_node_node_validation():
 
     with pytest.raises(SchemaNodeError):
         instance.number = 100
+
+
+def test_plain_class_nodes():
+    """Test nodes of plain classes keeping their own values.
+    """
+
+    shared = IntegerNode()
+
+    class Plain(object):
+        a = IntegerNode()
+        b = StringNode()
+        c = shared
+        d = shared
+
+    plain = Plain()
+    plain.a = '1'
+    plain.b = 'x'
+    plain.c = 2
+    plain.d = 3
+
+    assert (plain.a, plain.b, plain.c, plain.d) == (1, 'x', 2, 3)
+    assert (Plain.__dict__['a'].alias, Plain.__dict__['d'].alias) == ('a', 'd')
+
+
+def test_mapping_node_lazy_and_typed():
+    """Test nodes.MappingNode lazy decoding and typed values.
+    """
+
+    class Test(BaseSchema):
+        blob = MappingNode(lazy=True)
+        counts = MappingNode(values=IntegerNode(validators=[lambda x: x >= 0]), default=None)
+
+    instance = Test(blob=b'{"a": [1, 2]}', counts={'a': '1', 'b': 2})
+
+    assert instance.counts == {'a': 1, 'b': 2}
+    assert instance.serialize('blob', raw_mappings=True)['blob'] == b'{"a": [1, 2]}'
+    assert instance.blob == {'a': [1, 2]}
+    assert instance.blob is instance.blob
+    assert instance.serialize('blob', raw_mappings=True)['blob'] == {'a': [1, 2]}
+
+    with pytest.raises(SchemaNodeError):
+        Test(counts={'a': 'one'})
+
+    with pytest.raises(SchemaNodeError):
+        Test(counts='{"a": -1}')
+
+    broken = Test(blob='{"a": ')
+
+    with pytest.raises(SchemaNodeError):
+        broken.blob
+
+    assert Test(blob={'b': 1}).blob == {'b': 1}
+
+
+def test_union_node():
+    """Test nodes.UnionNode discriminated and ordered dispatch.
+    """
+
+    class PointSchema(BaseSchema):
+        lat = FloatNode(required=True)
+        lng = FloatNode(required=True)
+
+    class LineSchema(BaseSchema):
+        points = SchemaNode(PointSchema, array=True, required=True)
+
+    class ShapeSchema(BaseSchema):
+        shape = UnionNode(discriminator='type', mapping={'point': PointSchema, 'line': LineSchema})
+        geometry = UnionNode(schemas=[PointSchema, LineSchema], default=None)
+
+    shape = ShapeSchema(shape={'type': 'point', 'lat': '1', 'lng': 2})
+
+    assert shape.shape == OrderedDict([('type', 'point'), ('lat', 1.0), ('lng', 2.0)])
+
+    with pytest.raises(SchemaNodeError) as error:
+        ShapeSchema(shape={'type': 'polygon'})
+
+    assert 'expected one of' in error.value.args[0]
+
+    with pytest.raises(SchemaNodeError) as error:
+        ShapeSchema(shape={'type': 'point', 'lat': 'x', 'lng': 2})
+
+    assert 'PointSchema.lat' in error.value.args[0]
+
+    with pytest.raises(SchemaNodeError):
+        ShapeSchema(shape={'lat': 1})
+
+    union = ShapeSchema.geometry.field_type
+    line = {'points': [{'lat': 1, 'lng': 2}]}
+
+    assert len(ShapeSchema(geometry=line).geometry['points']) == 1
+    assert union._shapes == {frozenset(['points']): LineSchema}
+    assert ShapeSchema(geometry={'lat': 1, 'lng': 2}).geometry == OrderedDict([('lat', 1.0), ('lng', 2.0)])
+
+    with pytest.raises(SchemaNodeError) as error:
+        ShapeSchema(geometry={'foo': 1})
+
+    assert 'No schema matches' in error.value.args[0]
+
+
+def test_schema_node_array_batch():
+    """Test batched cleaning of nested schema arrays.
+    """
+
+    class LineSchema(BaseSchema):
+        sku = StringNode(required=True)
+        quantity = IntegerNode(default=1, validators=[lambda x: x > 0])
+
+    class PreparedLineSchema(LineSchema):
+
+        @staticmethod
+        def prepare_sku(value):
+            return value.upper()
+
+    class OrderSchema(BaseSchema):
+        lines = SchemaNode(LineSchema, array=True)
+        prepared = SchemaNode(PreparedLineSchema, array=True, default=None)
+
+    lines = [{'sku': 'a'}, {'sku': 'b', 'quantity': '3'}]
+    order = OrderSchema(lines=lines, prepared=lines)
+
+    assert order.lines == [LineSchema(**line).to_dict for line in lines]
+    assert [line['sku'] for line in order.prepared] == ['A', 'B']
+
+    for invalid, message in [({'quantity': 2}, 'Missing Required'), ({'sku': 'c', 'foo': 1}, 'Invalid Attributes'),
+                             ({'sku': 'c', 'quantity': 0}, 'LineSchema.quantity'), ('sku', 'item 2')]:
+        with pytest.raises(SchemaNodeError) as error:
+            OrderSchema(lines=lines + [invalid])
+
+        assert 'item 2' in error.value.args[0] and message in error.value.args[0]
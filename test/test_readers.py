@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.readers` module.
+"""
+
+import io
+import sqlite3
+from datetime import datetime
+import pytest
+from schema_factory import (schema_factory, IntegerNode, FloatNode, StringNode, BooleanNode, TimestampNode,
+                            SchemaError)
+
+
+@pytest.fixture(scope='module')
+def record_schema():
+    """Tabular schema fixture.
+    """
+    return schema_factory(
+        schema_name='record',
+        name=StringNode(required=True),
+        count=IntegerNode(default=7, validators=[lambda x: x >= 0]),
+        ratio=FloatNode(),
+        active=BooleanNode(),
+        created=TimestampNode(),
+        tags=StringNode(array=True)
+    )
+
+
+def test_from_csv(record_schema):
+    """Test streaming CSV validation.
+    """
+
+    data = io.StringIO(
+        'name,count,ratio,active,created\n'
+        'foo,1,0.5,TRUE,2016-01-28T15:30:26.979\n'
+        'bar,,1e3,false,\n'
+        '\n'
+        'baz,-1,0,true,\n'
+        ',2,0,true,\n'
+        'qux,x,0,true,\n'
+    )
+
+    errors = []
+    records = list(record_schema.from_csv(data, on_error=lambda *args: errors.append(args)))
+
+    assert [record.to_dict for record in records] == [
+        record_schema(name='foo', count=1, ratio=0.5, active=True, created=datetime(2016, 1, 28, 15, 30, 26)).to_dict,
+        record_schema(name='bar', ratio=1000.0, active=False).to_dict,
+    ]
+    assert records[1].count == 7
+    assert [(line, row[0]) for line, row, _ in errors] == [(5, 'baz'), (6, ''), (7, 'qux')]
+    assert 'Invalid value `x`' in errors[2][2].args[0]
+
+    with pytest.raises(SchemaError) as error:
+        list(record_schema.from_csv(io.StringIO('name,count\nfoo,x\n')))
+
+    assert error.value.args[0].startswith('line 2:')
+
+    with pytest.raises(SchemaError):
+        list(record_schema.from_csv(io.StringIO('name,foo\nbar,baz\n')))
+
+    with pytest.raises(SchemaError):
+        list(record_schema.from_csv(io.StringIO('count\n1\n')))
+
+    assert list(record_schema.from_csv(io.StringIO(''))) == []
+
+
+def test_from_rows(record_schema):
+    """Test building instances from DB cursor rows.
+    """
+
+    connection = sqlite3.connect(':memory:')
+    connection.execute('CREATE TABLE records (name TEXT, count INTEGER, ratio REAL, created TEXT)')
+    connection.executemany('INSERT INTO records VALUES (?, ?, ?, ?)', [
+        ('foo', 1, 0.5, '2016-01-28 15:30:26'),
+        ('bar', None, 2, None),
+        ('baz', -1, 0, None),
+    ])
+
+    errors = []
+    cursor = connection.execute('SELECT name, count, ratio, created FROM records')
+    records = list(record_schema.from_rows(cursor, batch_size=2, on_error=lambda *args: errors.append(args)))
+
+    assert [record.to_dict for record in records] == [
+        record_schema(name='foo', count=1, ratio=0.5, created=datetime(2016, 1, 28, 15, 30, 26)).to_dict,
+        record_schema(name='bar', ratio=2.0).to_dict,
+    ]
+    assert [(number, row[0]) for number, row, _ in errors] == [(3, 'baz')]
+
+    rows = [('foo', '3', True), ('bar', 4, 'false')]
+
+    assert list(record_schema.from_rows(rows, columns=['name', 'count', 'active'], as_dict=True)) == [
+        {'name': 'foo', 'count': 3, 'active': True},
+        {'name': 'bar', 'count': 4, 'active': False},
+    ]
+
+    with pytest.raises(SchemaError):
+        list(record_schema.from_rows(rows))
+
+    with pytest.raises(SchemaError):
+        list(record_schema.from_rows([('foo', 'x')], columns=['name', 'count']))
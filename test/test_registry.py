@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+"""Unit tests for `schema_factory.registry` module.
+"""
+
+import copy
+import os
+import pickle
+import subprocess
+import sys
+from collections import OrderedDict
+from datetime import datetime
+import pytest
+from schema_factory import (schema_factory, SchemaRegistry, SchemaNode, UnionNode, FloatNode, StringNode, IntegerNode,
+                            TimestampNode, SchemaError, SchemaNodeError)
+from schema_factory import registry as registry_module
+from schema_factory.registry import schema_definition, build_schema
+
+
+def positive(value):
+    return value > 0
+
+
+@pytest.fixture(scope='module')
+def region_schema():
+    """Dynamic nested schema fixture.
+    """
+    point_schema = schema_factory('point', frozen=True, lat=FloatNode(), lng=FloatNode())
+
+    return schema_factory(
+        schema_name='region',
+        name=StringNode(required=True),
+        population=IntegerNode(validators=[positive], default=1),
+        location=SchemaNode(point_schema),
+        keywords=StringNode(array=True, default=[])
+    )
+
+
+def test_pickle_dynamic_schema(region_schema):
+    """Test pickling instances of dynamic schema classes.
+    """
+
+    region = region_schema(name='Athens', population='3', location={'lat': 1, 'lng': 2})
+    region.update(keywords=['a'])
+
+    restored = pickle.loads(pickle.dumps(region))
+
+    assert restored.__class__ is region_schema
+    assert restored.to_dict == region.to_dict
+    assert restored.dirty_fields() == frozenset(['keywords'])
+
+    duplicate = copy.copy(region)
+    duplicate.name = 'Ilion'
+
+    assert region.dirty_fields() == frozenset(['keywords'])
+
+    point_schema = region_schema.location.field_type.cast_type
+    point = point_schema(lat=1, lng=2)
+
+    assert pickle.loads(pickle.dumps(point)) == point
+
+
+def test_copy_non_portable_schema():
+    """Test copying instances of schemas that have no portable definition.
+    """
+
+    class LocalSchema(schema_factory('local', code=StringNode(validators=[lambda x: len(x) == 2]),
+                                     tags=StringNode(array=True))):
+
+        @property
+        def upper(self):
+            return self.code.upper()
+
+    local = LocalSchema(code='gr', tags=['a'])
+    local.update(code='it')
+
+    shallow = copy.copy(local)
+    deep = copy.deepcopy(local)
+    shallow.code = 'fr'
+
+    assert local.code == 'it' and local.dirty_fields() == frozenset(['code'])
+    assert deep.to_dict == local.to_dict and deep.tags is not local.tags
+    assert shallow.tags is local.tags and shallow.upper == 'FR'
+
+    with pytest.raises(SchemaError):
+        pickle.dumps(local)
+
+
+def test_build_schema_definition(region_schema):
+    """Test rebuilding schema classes from definitions.
+    """
+
+    definition = schema_definition(region_schema)
+    rebuilt = build_schema(definition.replace('RegionSchema', 'RebuiltSchema'))
+
+    assert rebuilt.__name__ == 'RebuiltSchema'
+    assert rebuilt.schema_nodes == region_schema.schema_nodes
+    assert rebuilt.required == {'name'}
+    assert rebuilt(name='Foo', location={'lat': '1', 'lng': 0}).location == {'lat': 1.0, 'lng': 0.0}
+
+    with pytest.raises(SchemaNodeError):
+        rebuilt(name='Foo', population=-1)
+
+    with pytest.raises(SchemaError):
+        schema_definition(schema_factory('lambda', number=IntegerNode(validators=[lambda x: x])))
+
+    for default in (datetime(2016, 1, 1), (1, 2), {1: 'a'}, float('nan')):
+        dated_schema = schema_factory('dated', created=TimestampNode(default=default))
+
+        with pytest.raises(SchemaError):
+            schema_definition(dated_schema)
+
+        with pytest.raises(SchemaError):
+            pickle.dumps(dated_schema())
+
+    point_schema = region_schema.location.field_type.cast_type
+    shape_schema = schema_factory('shape', shape=UnionNode(discriminator='type', mapping={'point': point_schema}))
+    definition = schema_definition(shape_schema).replace('PointSchema', 'RebuiltPointSchema')
+    rebuilt = build_schema(definition)
+
+    assert rebuilt(shape={'type': 'point', 'lat': '1'}).shape == {'type': 'point', 'lat': 1.0, 'lng': None}
+
+
+def test_registry_export_load(region_schema, tmpdir, monkeypatch):
+    """Test registry export / load round trip.
+    """
+
+    registry = SchemaRegistry()
+    registry.register(region_schema, name='region', version=1)
+    registry.register(region_schema, name='region', version=2)
+
+    assert registry.get('region') is registry.get('region', 2) is region_schema
+
+    with pytest.raises(SchemaError):
+        registry.get('region', 3)
+
+    path = str(tmpdir.join('schemas.json'))
+    registry.export(path)
+
+    # A cold process: no definition has been built yet.
+    monkeypatch.setattr(registry_module, '_built_schemas', {})
+
+    warm = SchemaRegistry()
+    schemas = warm.load(path)
+    rebuilt = warm.get('region')
+
+    assert len(warm) == 2 and ('region', 1) in warm
+    assert schemas[0] is schemas[1] is rebuilt
+    assert rebuilt is not region_schema
+    assert rebuilt.__name__ == region_schema.__name__ and rebuilt.required == {'name'}
+    assert rebuilt.location.field_type.cast_type.__frozen__
+    assert rebuilt(name='Foo', population='2', location={'lat': '1'}).to_dict == OrderedDict([
+        ('keywords', []), ('location', {'lat': 1.0, 'lng': None}), ('name', 'Foo'), ('population', 2)])
+
+    with pytest.raises(SchemaNodeError):
+        rebuilt(name='Foo', population=0)
+
+    # Instances pickled by definition restore to the class registered for it.
+    restored = pickle.loads(pickle.dumps(region_schema(name='Athens')))
+
+    assert restored.__class__ is rebuilt
+
+
+def test_registry_spawned_process(region_schema, tmpdir):
+    """Test a fresh interpreter rebuilding exported schemas and unpickling instances.
+    """
+
+    registry = SchemaRegistry()
+    registry.register(region_schema, name='region')
+    path = str(tmpdir.join('schemas.json'))
+    registry.export(path)
+    payload = tmpdir.join('region.pickle')
+    payload.write_binary(pickle.dumps(region_schema(name='Athens', population=3)))
+
+    script = (
+        'import pickle, sys\n'
+        'from schema_factory import SchemaRegistry\n'
+        'registry = SchemaRegistry()\n'
+        'registry.load(sys.argv[1])\n'
+        'region = pickle.loads(open(sys.argv[2], "rb").read())\n'
+        'assert region.__class__ is registry.get("region")\n'
+        'print(region.name, region.population)\n'
+    )
+
+    output = subprocess.check_output([sys.executable, '-c', script, path, str(payload)],
+                                     cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    assert output.decode().split() == ['Athens', '3']
@@ -2,8 +2,12 @@
 """Unit tests for `schema_factory.schema` module
 """
 
+import sys
 import pytest
-from schema_factory.errors import SchemaError
+from concurrent.futures import ThreadPoolExecutor
+from schema_factory import (schema_factory, StringNode, MappingNode, IntegerNode, FloatNode, SchemaNode, BaseSchema,
+                            BooleanNode, computed)
+from schema_factory.errors import SchemaError, SchemaNodeError
 from collections import OrderedDict
 
 
@@ -50,3 +54,379 @@ def test_base_schema_subclass(mock_base_schema_subclass):
 
     with pytest.raises(SchemaError):
         schema.serialize('bar')
+
+
+def test_frozen_schema():
+    """Testing frozen schema instances.
+    """
+
+    FrozenSchema = schema_factory(
+        schema_name='frozen',
+        frozen=True,
+        name=StringNode(required=True),
+        tags=StringNode(array=True, default=[]),
+        meta=MappingNode(default=None)
+    )
+
+    schema = FrozenSchema(name='Foo', tags=['a', 'b'], meta={'a': [1, 2]})
+
+    with pytest.raises(SchemaError):
+        schema.name = 'Bar'
+
+    with pytest.raises(SchemaError):
+        schema.meta['b'] = 1
+
+    assert schema.tags == ('a', 'b')
+    assert schema == FrozenSchema(name='Foo', tags=('a', 'b'), meta={'a': [1, 2]})
+    assert {schema: 1}[FrozenSchema(name='Foo', tags=['a', 'b'], meta={'a': [1, 2]})] == 1
+    assert hash(FrozenSchema(name='Foo')) == hash(FrozenSchema(name='Foo', tags=[]))
+
+    replaced = schema.replace(name=42)
+
+    assert replaced.name == '42' and replaced.tags is schema.tags
+    assert schema.name == 'Foo'
+    assert replaced != schema
+
+    with pytest.raises(SchemaError):
+        schema.replace(foo='bar')
+
+    FlagSchema = schema_factory('flag', name=StringNode(), frozen=BooleanNode())
+    flag = FlagSchema(name='Foo', frozen='true')
+
+    assert flag.frozen is True and not FlagSchema.__frozen__ and FlagSchema.schema_nodes == ['frozen', 'name']
+
+    with pytest.raises(SchemaError):
+        schema_factory('flag', frozen='yes')
+
+    with pytest.raises(SchemaError):
+        class ThawedSchema(FrozenSchema, frozen=False):
+            pass
+
+    class FrozenChildSchema(FrozenSchema):
+        pass
+
+    child = FrozenChildSchema(name='Foo')
+
+    assert FrozenChildSchema.__frozen__ and hash(child) == hash(FrozenChildSchema(name='Foo'))
+
+
+def test_schema_update(mock_schema):
+    """Testing partial updates and dirty field tracking.
+    """
+
+    schema = mock_schema(name='Bar', scores=[0.34])
+
+    assert schema.dirty_fields() == frozenset()
+    assert '_dirty' not in schema.__dict__
+    assert '_dirty' not in mock_schema._from_cleaned({'name': 'Bar'}).__dict__
+
+    schema.number = 5
+
+    assert schema.dirty_fields() == frozenset(['number'])
+
+    schema.mark_clean()
+    schema.update(number='3', scores=[1, 2])
+
+    assert schema.number == 3 and schema.scores == [1.0, 2.0]
+    assert dict(schema.serialize(dirty_only=True)) == {'number': 3, 'scores': [1.0, 2.0]}
+
+    with pytest.raises(SchemaNodeError):
+        schema.update(name='Foo', number='three')
+
+    assert schema.name == 'Bar'
+
+    with pytest.raises(SchemaError):
+        schema.update(foo='bar')
+
+    schema.mark_clean()
+    schema.name = 'Foo'
+
+    assert schema.serialize(dirty_only=True) == OrderedDict([('name', 'Foo')])
+    assert schema.serialize('number', dirty_only=True) == OrderedDict()
+
+
+def test_shared_nodes_concurrent_construction():
+    """Testing shared nodes under concurrent schema construction.
+    """
+
+    shared = IntegerNode(validators=[lambda x: x >= 0])
+
+    FirstSchema = schema_factory(schema_name='first', value=shared)
+    SecondSchema = schema_factory(schema_name='second', other=shared, value=shared)
+
+    assert FirstSchema.value.alias == 'value'
+    assert SecondSchema.other.alias == 'other'
+
+    def construct(offset):
+        for number in range(offset, offset + 500):
+            first = FirstSchema(value=str(number))
+            second = SecondSchema(other=number + 1, value=number)
+
+            if (first.value, second.other, second.value) != (number, number + 1, number):
+                return False
+
+        return True
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(executor.map(construct, range(0, 16000, 500)))
+
+
+def test_schema_inheritance(mock_base_schema_subclass):
+    """Testing node, property and prepare hook inheritance.
+    """
+
+    class GeographyMixin(object):
+
+        @property
+        def zone(self):
+            return 'EU'
+
+    class LocationSchema(GeographyMixin, mock_base_schema_subclass):
+        name = StringNode(required=True)
+
+        @staticmethod
+        def prepare_lat(value):
+            return round(value)
+
+    class CityLocationSchema(LocationSchema):
+        lng = IntegerNode(default=0)
+
+    assert LocationSchema.schema_nodes == ['lat', 'lng', 'name']
+    assert LocationSchema.required == {'lat', 'name'}
+    assert LocationSchema.property_nodes == ['srid', 'zone']
+    assert CityLocationSchema.schema_nodes == ['lat', 'lng', 'name']
+
+    with pytest.raises(SchemaError):
+        LocationSchema(name='Athens')
+
+    location = CityLocationSchema(lat='37.9', lng='23', name='Athens')
+
+    assert location.to_dict == OrderedDict([('lat', 38), ('lng', 23), ('name', 'Athens')])
+    assert dict(location.serialize('srid', 'zone')) == {'srid': 4326, 'zone': 'EU'}
+    assert mock_base_schema_subclass(lat=37.9).lat == 37.9
+
+
+def test_schema_inheritance_mro():
+    """Testing mixin nodes and diamond inheritance follow attribute lookup.
+    """
+
+    class GeoMixin(object):
+        lat = FloatNode(required=True)
+        lng = FloatNode()
+
+    class PlaceSchema(GeoMixin, BaseSchema):
+        name = StringNode()
+
+    class OtherPlaceSchema(GeoMixin, BaseSchema):
+        pass
+
+    assert PlaceSchema.required == {'lat'}
+    assert PlaceSchema(lat=1, lng=2, name='x').to_dict == OrderedDict([('lat', 1.0), ('lng', 2.0), ('name', 'x')])
+    assert OtherPlaceSchema(lat=3, lng=4).to_dict == OrderedDict([('lat', 3.0), ('lng', 4.0)])
+
+    class RenamedSchema(BaseSchema):
+        latitude = GeoMixin.lat
+
+    assert RenamedSchema(latitude=5).latitude == 5.0
+    assert PlaceSchema(lat=6).lat == 6.0
+
+    class Base(BaseSchema):
+        x = IntegerNode()
+
+    class B(Base):
+        x = StringNode(required=True)
+
+    class A(Base):
+        pass
+
+    class C(A, B):
+        pass
+
+    assert C._node_map['x'] is B.__dict__['x']
+    assert C.required == {'x'}
+    assert C(x='5').x == '5'
+
+    with pytest.raises(SchemaError):
+        C()
+
+
+def test_schema_reserved_node_names():
+    """Testing nodes named after schema attributes.
+    """
+
+    for name in ('update', 'validate', 'pack', 'to_dict', 'required', 'validation_cache'):
+        with pytest.raises(SchemaError):
+            schema_factory('reserved', **{name: StringNode()})
+
+    class Mixin(object):
+        replace = StringNode()
+
+    with pytest.raises(SchemaError):
+        type('MixinSchema', (Mixin, BaseSchema), {})
+
+
+def test_schema_projection(mock_base_schema_subclass):
+    """Testing field projection with nested paths.
+    """
+
+    RegionSchema = schema_factory(
+        schema_name='projected',
+        name=StringNode(required=True),
+        code=StringNode(validators=[lambda x: len(x) == 2]),
+        location=SchemaNode(mock_base_schema_subclass),
+        boundary=SchemaNode(mock_base_schema_subclass, array=True)
+    )
+
+    data = {
+        'name': 42,
+        'code': 'invalid',
+        'location': {'lat': '1', 'lng': 'invalid'},
+        'boundary': [{'lat': 1}, {'lat': '2', 'lng': 'invalid'}]
+    }
+
+    assert RegionSchema.project(data, ['name', 'location.lat', 'boundary.lat']) == OrderedDict([
+        ('name', '42'),
+        ('location', OrderedDict([('lat', 1.0)])),
+        ('boundary', [OrderedDict([('lat', 1.0)]), OrderedDict([('lat', 2.0)])]),
+    ])
+    assert RegionSchema.project({'name': 'Foo'}, ['name', 'location.lat']) == OrderedDict([
+        ('name', 'Foo'), ('location', None)
+    ])
+
+    with pytest.raises(SchemaNodeError):
+        RegionSchema.project(data, ['code'])
+
+    with pytest.raises(SchemaError):
+        RegionSchema.project({'location': {'lng': 1}}, ['location.lat'])
+
+    with pytest.raises(SchemaError):
+        RegionSchema.project(data, ['name.foo'])
+
+    with pytest.raises(SchemaError):
+        RegionSchema.project(data, ['foo'])
+
+
+def test_schema_memory_report(mock_schema):
+    """Testing memory size estimates.
+    """
+
+    shared_scores = [1.0, 2.0, 3.0]
+    first = mock_schema(name='Foo', scores=shared_scores)
+    second = mock_schema(name='Bar', scores=[4.0])
+
+    assert first.memory_size() > sys.getsizeof(first) + sys.getsizeof(first.__dict__)
+
+    report = mock_schema.memory_report([first, second])
+
+    assert report['instances'] == 2
+    assert report['total_bytes'] == report['overhead_bytes'] + sum(report['field_bytes'].values())
+    assert report['field_bytes']['number'] == 0
+    assert report['total_bytes'] < first.memory_size() + second.memory_size()
+    assert mock_schema.memory_report([])['bytes_per_instance'] == 0
+
+
+def test_schema_from_trusted():
+    """Testing trusted construction with sampled validation.
+    """
+
+    TrustedSchema = schema_factory(
+        schema_name='trusted',
+        name=StringNode(required=True),
+        count=IntegerNode(validators=[lambda x: x >= 0])
+    )
+
+    mismatches = []
+    TrustedSchema.on_trusted_mismatch = lambda schema, data, error: mismatches.append((schema, data, error))
+
+    trusted = TrustedSchema.from_trusted(name='Foo', count=-1)
+
+    assert trusted.count == -1 and trusted.dirty_fields() == frozenset()
+    assert TrustedSchema.trusted_mismatches == 0
+
+    TrustedSchema.trusted_sample_rate = 2
+
+    for data in [{'name': 'Foo', 'count': 1}, {'name': 'Foo', 'count': -1},
+                 {'name': 'Foo', 'count': 2}, {'name': 'Foo', 'count': '3'}]:
+        TrustedSchema.from_trusted(**data)
+
+    assert TrustedSchema.trusted_mismatches == 2
+    assert [data['count'] for _, data, _ in mismatches] == [-1, '3']
+    assert isinstance(mismatches[0][2], SchemaNodeError)
+    assert isinstance(mismatches[1][2], SchemaError)
+
+
+def test_schema_computed():
+    """Testing memoized computed properties and their invalidation.
+    """
+
+    calls = []
+
+    class GeoMixin(object):
+
+        @computed(depends_on=())
+        def srid(self):
+            calls.append('srid')
+            return 4326
+
+    class PlaceSchema(GeoMixin, BaseSchema):
+        name = StringNode()
+        lat = IntegerNode()
+        lng = IntegerNode()
+
+        @computed(depends_on=['lat', 'lng'])
+        def point(self):
+            calls.append('point')
+            return 'POINT({} {})'.format(self.lng, self.lat)
+
+        @computed(depends_on=['point', 'srid'])
+        def ewkt(self):
+            calls.append('ewkt')
+            return 'SRID={};{}'.format(self.srid, self.point)
+
+        @computed
+        def label(self):
+            calls.append('label')
+            return '{} {}'.format(self.name, self.point)
+
+    assert PlaceSchema.property_nodes == ['ewkt', 'label', 'point', 'srid']
+
+    place = PlaceSchema(name='Athens', lat=38, lng=23)
+
+    assert place.serialize('ewkt', 'label')['ewkt'] == 'SRID=4326;POINT(23 38)'
+    assert place.serialize()['label'] == 'Athens POINT(23 38)'
+    assert sorted(calls) == ['ewkt', 'label', 'point', 'srid']
+
+    del calls[:]
+    place.name = 'Ilion'
+
+    assert place.ewkt == 'SRID=4326;POINT(23 38)' and place.label == 'Ilion POINT(23 38)'
+    assert calls == ['label']
+
+    del calls[:]
+    place.update(lat='37')
+    moved = place.replace(lng=24)
+
+    assert place.ewkt == 'SRID=4326;POINT(23 37)'
+    assert moved.ewkt == 'SRID=4326;POINT(24 37)' and place.point == 'POINT(23 37)'
+    assert sorted(calls) == ['ewkt', 'ewkt', 'point', 'point']
+
+    with pytest.raises(SchemaError):
+        class BrokenSchema(BaseSchema):
+            lat = IntegerNode()
+
+            @computed(depends_on=['lon'])
+            def point(self):
+                return self.lon
+
+
+def test_schema_sampling_counters_concurrent():
+    """Testing class level sampling counters under concurrent construction.
+    """
+
+    CountedSchema = schema_factory('counted', count=IntegerNode(validators=[lambda x: x >= 0]))
+    CountedSchema.trusted_sample_rate = 1
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: CountedSchema.from_trusted(count=-1), range(4000)))
+
+    assert CountedSchema.trusted_mismatches == 4000